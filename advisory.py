@@ -0,0 +1,318 @@
+"""Advisories and decision rules shared by the dashboard and other front ends.
+
+Everything here is a pure function of a prediction row (and its decoded
+forecasts), with no Streamlit dependency. The alert-risk and decision-matrix
+rules also come in vectorised form that classifies a whole date range in
+one pass and agrees with the scalar functions cell for cell.
+"""
+import numpy as np
+import pandas as pd
+
+from translations import translations
+
+# English advisories
+advisories_english = {
+    ("High", "Up"): {
+        "title": "CAUTION: High Risk, Rising Prices",
+        "message": "Commodity prices are rising but market is highly unstable. Avoid distress sales but be prepared for sharp reversals.",
+        "action": "Action: Hold inventory. Monitor daily. Set price targets. Be ready to sell on peaks.",
+        "color": "#f59e0b"
+    },
+    ("High", "Down"): {
+        "title": "ALERT: High Risk, Falling Prices",
+        "message": "Prices declining in volatile conditions. High probability of continued downward pressure.",
+        "action": "Action: Avoid panic selling. Store if possible. Wait for market stabilization.",
+        "color": "#ef4444"
+    },
+    ("High", "Stable"): {
+        "title": "WARNING: High Volatility, Uncertain Direction",
+        "message": "Market is unstable with no clear direction. Sharp price movements possible in either direction.",
+        "action": "Action: Stay cautious. Monitor closely. Prepare for rapid changes. Have both sell and hold strategies ready.",
+        "color": "#f59e0b"
+    },
+    ("Med", "Up"): {
+        "title": "FAVORABLE: Moderate Risk, Rising Prices",
+        "message": "Prices trending upward with manageable volatility. Good opportunity for strategic selling.",
+        "action": "Action: Consider selling portion of inventory. Good conditions for market transactions.",
+        "color": "#10b981"
+    },
+    ("Med", "Down"): {
+        "title": "CAUTION: Moderate Risk, Declining Prices",
+        "message": "Prices falling with moderate volatility. Exercise caution but not panic.",
+        "action": "Action: Hold inventory if possible. Wait for price recovery. Monitor for reversal signals.",
+        "color": "#f59e0b"
+    },
+    ("Med", "Stable"): {
+        "title": "NEUTRAL: Moderate Volatility, Stable Prices",
+        "message": "Market showing moderate activity with stable pricing. Reasonable conditions for trading.",
+        "action": "Action: Normal trading conditions. Standard selling strategies apply. Good time for planned transactions.",
+        "color": "#6366f1"
+    },
+    ("Low", "Up"): {
+        "title": "OPTIMAL: Low Risk, Rising Prices",
+        "message": "Best conditions! Prices rising in a stable environment. High confidence for continued growth.",
+        "action": "Action: Excellent selling opportunity. Market is favorable. Consider selling at current rates.",
+        "color": "#10b981"
+    },
+    ("Low", "Down"): {
+        "title": "STABLE: Low Risk, Declining Prices",
+        "message": "Prices declining gradually in stable conditions. Controlled downward movement.",
+        "action": "Action: Hold inventory. Wait for price stabilization. Good conditions to prepare for next cycle.",
+        "color": "#6366f1"
+    },
+    ("Low", "Stable"): {
+        "title": "IDEAL: Low Risk, Stable Prices",
+        "message": "Calm market with minimal volatility. Safe environment for all trading activities.",
+        "action": "Action: Ideal conditions for farming operations. Low risk environment. Safe to proceed with planned sales.",
+        "color": "#10b981"
+    }
+}
+
+
+# Marathi advisories
+advisories_marathi = {
+    ("High", "Up"): {
+        "title": "सावधगिरी: उच्च जोखीम, वाढणाऱ्या किंमती",
+        "message": "किंमती वाढत आहेत पण बाजार अत्यंत अस्थिर आहे. तातडीची विक्री टाळा पण तीव्र उलटसुलट होण्यासाठी तयार रहा.",
+        "action": "कृती: साठा ठेवा. दररोज निरीक्षण करा. किंमत लक्ष्य ठेवा. शिखरावर विकण्यास तयार रहा.",
+        "color": "#f59e0b"
+    },
+    ("High", "Down"): {
+        "title": "सावधानता: उच्च जोखीम, घटणाऱ्या किंमती",
+        "message": "अस्थिर परिस्थितीत किंमती घटत आहेत. सतत खालच्या दिशेने दबाव येण्याची उच्च शक्यता.",
+        "action": "कृती: घाबरून विक्री टाळा. शक्य असल्यास साठवा. बाजार स्थिर होण्याची प्रतीक्षा करा.",
+        "color": "#ef4444"
+    },
+    ("High", "Stable"): {
+        "title": "चेतावणी: उच्च अस्थिरता, अनिश्चित दिशा",
+        "message": "बाजार अस्थिर आहे आणि स्पष्ट दिशा नाही. दोन्ही दिशेने तीव्र किंमत बदल शक्य.",
+        "action": "कृती: सावध रहा. बारकाईने निरीक्षण करा. जलद बदलांसाठी तयार रहा. विक्री आणि होल्ड दोन्ही धोरणे ठेवा.",
+        "color": "#f59e0b"
+    },
+    ("Med", "Up"): {
+        "title": "अनुकूल: मध्यम जोखीम, वाढणाऱ्या किंमती",
+        "message": "व्यवस्थापन करण्यायोग्य अस्थिरतेसह किंमती वाढत आहेत. धोरणात्मक विक्रीसाठी चांगली संधी.",
+        "action": "कृती: साठ्याचा काही भाग विकण्याचा विचार करा. बाजार व्यवहारांसाठी चांगल्या परिस्थिती.",
+        "color": "#10b981"
+    },
+    ("Med", "Down"): {
+        "title": "सावधगिरी: मध्यम जोखीम, घटणाऱ्या किंमती",
+        "message": "मध्यम अस्थिरतेसह किंमती घटत आहेत. सावधगिरी बाळगा पण घाबरू नका.",
+        "action": "कृती: शक्य असल्यास साठा ठेवा. किंमत पुनर्प्राप्तीची प्रतीक्षा करा. उलटसुलट संकेतांसाठी निरीक्षण करा.",
+        "color": "#f59e0b"
+    },
+    ("Med", "Stable"): {
+        "title": "तटस्थ: मध्यम अस्थिरता, स्थिर किंमती",
+        "message": "स्थिर किंमतीसह बाजार मध्यम क्रियाकलाप दर्शवित आहे. व्यापारासाठी वाजवी परिस्थिती.",
+        "action": "कृती: सामान्य व्यापार परिस्थिती. मानक विक्री धोरणे लागू. नियोजित व्यवहारांसाठी चांगली वेळ.",
+        "color": "#6366f1"
+    },
+    ("Low", "Up"): {
+        "title": "इष्टतम: कमी जोखीम, वाढणाऱ्या किंमती",
+        "message": "सर्वोत्तम परिस्थिती! स्थिर वातावरणात किंमती वाढत आहेत. सतत वाढीसाठी उच्च आत्मविश्वास.",
+        "action": "कृती: उत्कृष्ट विक्री संधी. बाजार अनुकूल आहे. सध्याच्या दरावर विकण्याचा विचार करा.",
+        "color": "#10b981"
+    },
+    ("Low", "Down"): {
+        "title": "स्थिर: कमी जोखीम, घटणाऱ्या किंमती",
+        "message": "स्थिर परिस्थितीत किंमती हळूहळू घटत आहेत. नियंत्रित खालच्या दिशेने हालचाल.",
+        "action": "कृती: साठा ठेवा. किंमत स्थिरीकरणाची प्रतीक्षा करा. पुढील चक्रासाठी तयार होण्यासाठी चांगल्या परिस्थिती.",
+        "color": "#6366f1"
+    },
+    ("Low", "Stable"): {
+        "title": "आदर्श: कमी जोखीम, स्थिर किंमती",
+        "message": "किमान अस्थिरतेसह शांत बाजार. सर्व व्यापार क्रियाकलापांसाठी सुरक्षित वातावरण.",
+        "action": "कृती: शेती कार्यांसाठी आदर्श परिस्थिती. कमी जोखीम वातावरण. नियोजित विक्रीसह पुढे जाणे सुरक्षित.",
+        "color": "#10b981"
+    }
+}
+
+
+ADVISORIES = {
+    "English": advisories_english,
+    "मराठी (Marathi)": advisories_marathi,
+}
+
+DEFAULT_LANGUAGE = "English"
+VOLATILITY_LEVELS = ("Low", "Med", "High")
+PRICE_MOVEMENTS = ("Up", "Down", "Stable")
+VOLATILITY_ALIASES = {"Medium": "Med"}
+ADVISORY_FIELDS = ("title", "message", "action", "color")
+FALLBACK_KEY = ("Med", "Stable")
+# Calendar risk of a row without a CVI label
+UNKNOWN_LEVEL = "Unknown"
+
+ELEVATED_LEVELS = ("Med", "Medium", "High")
+# Alert risk is the most severe forecast label issued on a date
+ALERT_RANK = {"High": 2, "Med": 1, "Medium": 1}
+ALERT_LEVELS = np.array(["Low", "Med", "High"], dtype=object)
+
+# Decision-matrix cells: (situation key, action key, action color)
+DECISION_CELLS = {
+    'both_low': ('both_low', 'sell_normally', "#10b981"),
+    'seasonal_low_alert_high': ('seasonal_low_alert_high', 'be_cautious', "#f59e0b"),
+    'seasonal_high_alert_low': ('seasonal_high_alert_low', 'seasonal_risk_stable', "#6366f1"),
+    'both_high': ('both_high', 'strong_warning', "#ef4444"),
+}
+
+
+def build_advisory_catalogue(tables=ADVISORIES):
+    """Flatten per-language advisory tables into one (language, volatility, movement) map
+
+    Every language must cover every volatility/movement pair with every
+    field, otherwise a ValueError is raised here rather than at render time.
+    Label aliases such as "Medium" get their own keys so a lookup never has
+    to normalise its input.
+    """
+    missing = []
+    catalogue = {}
+    for language, table in tables.items():
+        if language not in translations:
+            missing.append(f"{language}: no UI translations")
+        for volatility in VOLATILITY_LEVELS:
+            for movement in PRICE_MOVEMENTS:
+                advisory = table.get((volatility, movement))
+                if advisory is None:
+                    missing.append(f"{language}: {volatility}/{movement}")
+                    continue
+                absent = [field for field in ADVISORY_FIELDS if not advisory.get(field)]
+                if absent:
+                    missing.append(f"{language}: {volatility}/{movement} lacks {', '.join(absent)}")
+                catalogue[(language, volatility, movement)] = advisory
+        for alias, volatility in VOLATILITY_ALIASES.items():
+            for movement in PRICE_MOVEMENTS:
+                if (language, volatility, movement) in catalogue:
+                    catalogue[(language, alias, movement)] = catalogue[(language, volatility, movement)]
+    if missing:
+        raise ValueError("Incomplete advisory catalogue: " + "; ".join(missing))
+    return catalogue
+
+
+ADVISORY_CATALOGUE = build_advisory_catalogue()
+
+
+def determine_price_movement_from_column(price_movement_str):
+    """Extract price movement from the price_movement column"""
+    if pd.isna(price_movement_str):
+        return "Stable"
+    
+    movement = str(price_movement_str).strip().lower()
+    
+    if 'up' in movement:
+        return "Up"
+    elif 'down' in movement:
+        return "Down"
+    else:
+        return "Stable"
+
+
+def volatility_levels(labels):
+    """CVI labels as an object array of calendar-risk levels, missing labels as "Unknown"
+
+    Shared by every path that classifies rows, so a missing label gets the
+    same fallback advisory (Med/Stable) and decision cell (both_high) in the
+    dashboard, the API and the broadcast export.
+    """
+    return pd.Series(labels, dtype=object).fillna(UNKNOWN_LEVEL).to_numpy(dtype=object)
+
+
+def price_movements(values):
+    """Up/Down/Stable for a price_movement column, parsing each distinct value once"""
+    values = pd.Series(values)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        mapping = {c: determine_price_movement_from_column(c) for c in values.cat.categories}
+        return values.astype(object).map(mapping).fillna("Stable").to_numpy(dtype=object)
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    mapped = np.array([determine_price_movement_from_column(v) for v in uniques] + ["Stable"], dtype=object)
+    return mapped[codes]
+
+
+def get_advisory(volatility, price_movement, language="English"):
+    """Generate actionable advisory based on volatility and price movement"""
+    advisory = ADVISORY_CATALOGUE.get((language, volatility, price_movement))
+    if advisory is None:
+        if language not in ADVISORIES:
+            language = DEFAULT_LANGUAGE
+        advisory = ADVISORY_CATALOGUE[(language,) + FALLBACK_KEY]
+    return advisory
+
+
+def get_alert_risk_level(forecast_data):
+    """Determine alert risk based on 3-day and 7-day forecasts"""
+    if forecast_data is None or forecast_data.empty:
+        return "Low"
+    
+    # Check 3-day and 7-day forecasts
+    labels = set(forecast_data['label'])
+    
+    # If any forecast is High, alert is High
+    if 'High' in labels:
+        return "High"
+    # If any forecast is Med/Medium, alert is Med
+    elif 'Med' in labels or 'Medium' in labels:
+        return "Med"
+    else:
+        return "Low"
+
+
+def alert_risk_levels(forecasts, dates):
+    """Vectorised `get_alert_risk_level` for every date in `dates`
+
+    `forecasts` is the decoded forecast table. Dates without forecasts are
+    "Low", like an empty frame in the scalar version.
+    """
+    dates = pd.DatetimeIndex(dates)
+    if forecasts is None or forecasts.empty:
+        return np.full(len(dates), "Low", dtype=object)
+    rank = forecasts['label'].astype(object).map(ALERT_RANK).fillna(0).astype(np.int8)
+    worst = rank.groupby(forecasts['source_date'].to_numpy(), sort=False).max()
+    return ALERT_LEVELS[worst.reindex(dates, fill_value=0).to_numpy()]
+
+
+def classify_situation(calendar_risk, alert_risk):
+    """Decision-matrix cell for a calendar risk and an alert risk
+
+    Returns the (situation, action) translation keys and the action color.
+    """
+    if calendar_risk in ['Low'] and alert_risk in ['Low']:
+        return DECISION_CELLS['both_low']
+    elif calendar_risk in ['Low'] and alert_risk in ['Med', 'Medium', 'High']:
+        return DECISION_CELLS['seasonal_low_alert_high']
+    elif calendar_risk in ['Med', 'Medium', 'High'] and alert_risk in ['Low']:
+        return DECISION_CELLS['seasonal_high_alert_low']
+    else:
+        return DECISION_CELLS['both_high']
+
+
+def classify_situations(calendar_risk, alert_risk):
+    """Vectorised `classify_situation` over arrays of calendar and alert risks
+
+    Returns a DataFrame with situation_key, action_key and action_color
+    columns, one row per input pair.
+    """
+    calendar_risk = np.asarray(calendar_risk, dtype=object)
+    alert_risk = np.asarray(alert_risk, dtype=object)
+    calendar_low = calendar_risk == 'Low'
+    alert_low = alert_risk == 'Low'
+    cell = np.select(
+        [calendar_low & alert_low,
+         calendar_low & np.isin(alert_risk, ELEVATED_LEVELS),
+         np.isin(calendar_risk, ELEVATED_LEVELS) & alert_low],
+        ['both_low', 'seasonal_low_alert_high', 'seasonal_high_alert_low'],
+        'both_high',
+    )
+    cells = pd.DataFrame.from_dict(
+        DECISION_CELLS, orient='index', columns=['situation_key', 'action_key', 'action_color'],
+    )
+    return cells.loc[cell].reset_index(drop=True)
+
+
+def decision_matrix(store):
+    """Calendar risk, alert risk and decision cell for every date of a PredictionStore"""
+    calendar = volatility_levels(store.frame['cvi_label'])
+    alert = alert_risk_levels(store.forecasts, store.frame['date'])
+    cells = classify_situations(calendar, alert)
+    cells.insert(0, 'date', store.frame['date'].to_numpy())
+    cells.insert(1, 'calendar_risk', calendar)
+    cells.insert(2, 'alert_risk', alert)
+    return cells
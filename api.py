@@ -0,0 +1,209 @@
+"""Headless JSON API serving the dashboard's predictions, advisories and forecasts.
+
+Reuses the same catalogue, date-indexed stores and precomputed view model as
+the Streamlit app, so answers match what the dashboard shows. Datasets stay
+resident in the process. Every response carries an ETag derived from the
+dataset version and the request, so repeat polls get a bodiless 304.
+
+    uvicorn api:app --host 0.0.0.0 --port 8000
+
+Endpoints (all accept ?commodity=&market= for partitioned datasets):
+
+    GET /partitions
+    GET /predictions/{date}
+    GET /advisory/{date}?lang=en|mr
+    GET /forecast/{date}
+    GET /range?from=YYYY-MM-DD&to=YYYY-MM-DD   (at most CVI_MAX_RANGE_DAYS days)
+
+Handlers run in the threadpool, so building a view model or a long range
+never blocks the event loop.
+"""
+import hashlib
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from catalog import Catalog
+from forecasts import forecasts_for
+from store import to_day
+from translations import LANGUAGE_CODES, resolve_language
+from view_model import view_model_for
+
+PREDICTION_FIELDS = [
+    "cvi_score", "cvi_label", "prob_low", "prob_med", "prob_high",
+    "price_momentum_7", "price_momentum_3", "vol_7", "vol_30",
+    "Modal_Price", "market_price",
+]
+VIEW_FIELDS = {
+    "price_movement": "price_movement",
+    "alert_risk": "alert_risk",
+    "situation": "situation_key",
+    "action": "action_key",
+}
+MAX_RANGE_DAYS = int(os.environ.get("CVI_MAX_RANGE_DAYS", "366"))
+
+catalog = Catalog()
+catalog.watch()
+
+
+def json_value(value):
+    """Plain JSON value for a numpy/pandas scalar (NaN becomes null)"""
+    if isinstance(value, (np.floating, float)):
+        if np.isnan(value):
+            return None
+        # str() of a float32 gives its shortest round-tripping form
+        return float(str(value))
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+    if hasattr(value, "isoformat"):
+        return value.date().isoformat() if hasattr(value, "date") else value.isoformat()
+    return value
+
+
+def prediction_records(store, view_model, lo, hi):
+    """Raw prediction values plus the derived direction, alert risk and decision cell for rows lo:hi
+
+    Built column-wise, so float32 values keep their numpy type until json_value.
+    """
+    rows = store.frame.iloc[lo:hi]
+    columns = {"date": rows["date"].dt.strftime("%Y-%m-%d").to_numpy()}
+    columns.update({field: rows[field].to_numpy() for field in PREDICTION_FIELDS if field in rows.columns})
+    columns.update({name: view_model.column(field, lo, hi) for name, field in VIEW_FIELDS.items()})
+    return [
+        {name: json_value(values[i]) for name, values in columns.items()}
+        for i in range(hi - lo)
+    ]
+
+
+def parse_date(value, name="date"):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(400, f"Invalid {name}: expected YYYY-MM-DD")
+
+
+async def load_store(request):
+    """Store for the partition named by ?commodity=&market= (default partition otherwise)"""
+    default_commodity, default_market = catalog.default_partition
+    commodity = request.query_params.get("commodity", default_commodity)
+    market = request.query_params.get("market", default_market)
+    if (commodity, market) not in catalog.partitions:
+        raise HTTPException(404, f"Unknown partition: {commodity}/{market}")
+    # First access reads from disk, keep that off the event loop
+    return await run_in_threadpool(catalog.load, commodity, market)
+
+
+def etag_for(store, request):
+    key = f"{store.version}:{request.url.path}?{request.url.query}"
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:16] + '"'
+
+
+def conditional(build):
+    """Wrap a handler body builder with ETag / If-None-Match handling"""
+    async def endpoint(request):
+        store = await load_store(request)
+        etag = etag_for(store, request)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        body = await run_in_threadpool(lambda: build(request, store, view_model_for(store)))
+        return JSONResponse(body, headers=headers)
+    return endpoint
+
+
+def position_or_404(store, day):
+    position = store.position(day)
+    if position < 0:
+        raise HTTPException(404, f"No prediction for {day.isoformat()}")
+    return position
+
+
+def prediction(request, store, view_model):
+    day = parse_date(request.path_params["date"])
+    position = position_or_404(store, day)
+    return prediction_records(store, view_model, position, position + 1)[0]
+
+
+def advisory(request, store, view_model):
+    day = parse_date(request.path_params["date"])
+    language = resolve_language(request.query_params.get("lang", "en"))
+    if language is None:
+        raise HTTPException(400, f"Unsupported lang; use one of {sorted(LANGUAGE_CODES)}")
+    position = position_or_404(store, day)
+    view = view_model.row(position, language)
+    return {
+        "date": day.isoformat(),
+        "language": language,
+        "volatility": view["volatility"],
+        "price_movement": view["price_movement"],
+        "advisory": view["advisory"],
+        "decision": {
+            "calendar_risk": view["volatility"],
+            "alert_risk": view["alert_risk"],
+            "situation": view["situation_text"],
+            "action": view["action_text"],
+            "color": view["action_color"],
+        },
+    }
+
+
+def forecast(request, store, view_model):
+    day = parse_date(request.path_params["date"])
+    position_or_404(store, day)
+    if view_model.forecasts is None:
+        return {"date": day.isoformat(), "forecasts": []}
+    rows = forecasts_for(view_model.forecasts, day).drop(columns="source_date")
+    # Column-wise so float32 values keep their numpy type until json_value
+    columns = {name: rows[name].to_numpy() for name in rows.columns}
+    columns["confidence"] = columns["confidence"].round(2)
+    return {
+        "date": day.isoformat(),
+        "forecasts": [
+            {name: json_value(values[i]) for name, values in columns.items()}
+            for i in range(len(rows))
+        ],
+    }
+
+
+def date_range(request, store, view_model):
+    start = parse_date(request.query_params.get("from"), "from")
+    end = parse_date(request.query_params.get("to"), "to")
+    if end < start:
+        raise HTTPException(400, "'to' must not be before 'from'")
+    days_back = to_day(end) - to_day(start)
+    if days_back >= MAX_RANGE_DAYS:
+        raise HTTPException(400, f"Range too long; request at most {MAX_RANGE_DAYS} days at a time")
+    lo, hi = store.bounds(end, days_back)
+    return {
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "summary": store.window_stats(end, days_back),
+        "predictions": prediction_records(store, view_model, lo, hi),
+    }
+
+
+async def partitions(request):
+    return JSONResponse({
+        "partitions": [
+            {"commodity": commodity, "market": market}
+            for commodity, market in catalog.partitions
+        ],
+    })
+
+
+app = Starlette(routes=[
+    Route("/partitions", partitions),
+    Route("/predictions/{date}", conditional(prediction)),
+    Route("/advisory/{date}", conditional(advisory)),
+    Route("/forecast/{date}", conditional(forecast)),
+    Route("/range", conditional(date_range)),
+])
@@ -0,0 +1,189 @@
+"""Streaming loader for large multi-market prediction archives.
+
+The historical archive is one CSV with a row per date and market, mostly
+`multi_next` text, and can be several gigabytes. It is read in fixed-size
+chunks. Each chunk is filtered by date range and market, its forecasts are
+decoded, and it is appended to the columnar cache as Arrow record batches,
+so peak memory follows the chunk size, not the file size:
+
+    predictions, forecasts = read_archive("archive.csv", market="lasalgaon",
+                                          start="2016-01-01", end="2016-12-31")
+
+Later calls with the same filter memory-map the cached result.
+"""
+import hashlib
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+from forecasts import build_forecast_table
+from predictions import CACHE_VERSION, RAW_COLUMNS, SCHEMA_DTYPES, _read_cache_metadata, cache_path_for, read_cache
+from store import PredictionStore
+
+CHUNK_ROWS = int(os.environ.get("CVI_ARCHIVE_CHUNK_ROWS", "100000"))
+PARTITION_COLUMNS = ["commodity", "market"]
+
+
+def iter_archive(file_path, start=None, end=None, markets=None, chunk_rows=CHUNK_ROWS):
+    """Yield (predictions, forecasts) per chunk of `file_path`, filtered while reading
+
+    `markets` limits rows to those markets (the archive needs a `market`
+    column for that). Forecast rows carry the market of their source row.
+    """
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    dtypes = {**SCHEMA_DTYPES, **{col: "category" for col in PARTITION_COLUMNS}}
+
+    reader = pd.read_csv(file_path, dtype=dtypes, parse_dates=['date'], chunksize=chunk_rows)
+    with reader:
+        for chunk in reader:
+            keep = pd.Series(True, index=chunk.index)
+            if start is not None:
+                keep &= chunk['date'] >= start
+            if end is not None:
+                keep &= chunk['date'] <= end
+            if markets is not None:
+                if 'market' not in chunk.columns:
+                    raise ValueError(f"{file_path} has no 'market' column to filter on")
+                keep &= chunk['market'].isin(markets)
+            chunk = chunk[keep]
+
+            if 'market' in chunk.columns:
+                parts = [
+                    build_forecast_table(group).assign(market=market)
+                    for market, group in chunk.groupby('market', observed=True, sort=False)
+                ]
+                forecasts = pd.concat(parts, ignore_index=True) if parts else \
+                    build_forecast_table(chunk).assign(market=None)
+                forecasts['market'] = forecasts['market'].astype('category')
+            else:
+                forecasts = build_forecast_table(chunk)
+            yield chunk.drop(columns=RAW_COLUMNS, errors="ignore"), forecasts
+
+
+class _BatchWriter:
+    """Arrow IPC file written one DataFrame chunk at a time
+
+    Categorical columns keep one growing dictionary across chunks (new
+    values are appended, never reordered), so every chunk after the first
+    is written as a dictionary delta and the file maps back into pandas
+    categoricals. Their Arrow type is fixed to int32-indexed strings up
+    front, so an empty first chunk or a growing dictionary cannot change
+    the schema.
+    """
+
+    def __init__(self, path, fingerprint):
+        self.path = path
+        self.tmp_path = f"{path}.{os.getpid()}.tmp"
+        self.fingerprint = fingerprint
+        self.categories = {}
+        self.schema = None
+        self.sink = None
+        self.writer = None
+
+    def _stabilise(self, df):
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                known = self.categories.setdefault(col, [])
+                seen = set(known)
+                known.extend(sorted(v for v in df[col].cat.categories if v not in seen))
+                df[col] = df[col].cat.set_categories(known)
+        return df
+
+    def write(self, df):
+        df = self._stabilise(df.reset_index(drop=True))
+        if self.writer is None:
+            schema = pa.Schema.from_pandas(df, preserve_index=False)
+            for i, field in enumerate(schema):
+                if pa.types.is_dictionary(field.type):
+                    schema = schema.set(i, field.with_type(pa.dictionary(pa.int32(), pa.large_string())))
+            metadata = dict(schema.metadata or {})
+            metadata.update({k.encode(): str(v).encode() for k, v in self.fingerprint.items()})
+            self.schema = schema.with_metadata(metadata)
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.sink = pa.OSFile(self.tmp_path, "wb")
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            self.writer = pa.ipc.new_file(self.sink, self.schema, options=options)
+        batch = pa.RecordBatch.from_pandas(df, schema=self.schema, preserve_index=False)
+        if batch.num_rows:
+            self.writer.write_batch(batch)
+
+    def close(self):
+        if self.writer is None:
+            # Nothing was read at all; still leave a valid (empty) file
+            self.write(pd.DataFrame())
+        self.writer.close()
+        self.sink.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        if self.sink is not None:
+            self.sink.close()
+            os.remove(self.tmp_path)
+
+
+def _filter_key(start, end, markets):
+    key = f"{start}|{end}|{sorted(markets) if markets is not None else None}"
+    return hashlib.sha1(key.encode()).hexdigest()[:10]
+
+
+def archive_cache_paths(file_path, start=None, end=None, markets=None):
+    """Prediction and forecast cache paths for one filter of an archive"""
+    key = _filter_key(start, end, markets)
+    return cache_path_for(file_path, f"archive-{key}"), cache_path_for(file_path, f"archive-{key}.forecasts")
+
+
+def stream_to_cache(file_path, start=None, end=None, markets=None, chunk_rows=CHUNK_ROWS):
+    """Stream the filtered archive into its prediction and forecast caches; returns both paths"""
+    stat = os.stat(file_path)
+    fingerprint = {
+        "cache_version": CACHE_VERSION,
+        "source_mtime_ns": str(stat.st_mtime_ns),
+        "source_size": str(stat.st_size),
+    }
+    paths = archive_cache_paths(file_path, start, end, markets)
+    writers = [_BatchWriter(path, fingerprint) for path in paths]
+    try:
+        for frames in iter_archive(file_path, start, end, markets, chunk_rows):
+            for writer, frame in zip(writers, frames):
+                writer.write(frame)
+        for writer in writers:
+            writer.close()
+    except BaseException:
+        for writer in writers:
+            writer.abort()
+        raise
+    return paths
+
+
+def read_archive(file_path, market=None, start=None, end=None, chunk_rows=CHUNK_ROWS):
+    """(predictions, forecasts) for one market and date range, streamed into the cache on first use"""
+    markets = [market] if market is not None else None
+    paths = archive_cache_paths(file_path, start, end, markets)
+    stat = os.stat(file_path)
+    fresh = all(
+        (meta or {}).get("cache_version") == CACHE_VERSION
+        and meta.get("source_mtime_ns") == str(stat.st_mtime_ns)
+        and meta.get("source_size") == str(stat.st_size)
+        for meta in map(_read_cache_metadata, paths)
+    )
+    if not fresh:
+        paths = stream_to_cache(file_path, start, end, markets, chunk_rows)
+
+    predictions, forecasts = (read_cache(path) for path in paths)
+    for frame in (predictions, forecasts):
+        for col in frame.columns:
+            if isinstance(frame[col].dtype, pd.CategoricalDtype):
+                frame[col] = frame[col].cat.remove_unused_categories()
+    # Chunks are written in file order; the store needs its forecasts by source date
+    forecasts = forecasts.sort_values(["source_date", "target_date"], kind="stable").reset_index(drop=True)
+    return predictions, forecasts
+
+
+def archive_store(file_path, market=None, start=None, end=None):
+    """PredictionStore for one market of an archive"""
+    predictions, forecasts = read_archive(file_path, market, start, end)
+    markets = [market] if market is not None else None
+    version = _filter_key(start, end, markets) + f"-{os.stat(file_path).st_mtime_ns}"
+    return PredictionStore(predictions, forecasts, version)
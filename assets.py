@@ -0,0 +1,80 @@
+"""Static stylesheet pipeline for the dashboard.
+
+The custom CSS lives in static/dashboard.css. At startup it is minified into
+static/dashboard.min.css, and each render only emits a tiny tag importing
+that file with a content-hash query string. Browsers can keep the file
+cached across reruns and sessions, and a changed stylesheet gets a new URL.
+The Inter font is served from static/fonts when it is bundled there;
+otherwise a system font stack applies, so first paint never waits on a
+third-party font host. Without Streamlit static file serving the minified CSS
+is inlined instead.
+"""
+import functools
+import hashlib
+import os
+import re
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_URL = "app/static"
+STYLESHEET_SOURCE = "dashboard.css"
+STYLESHEET_BUILD = "dashboard.min.css"
+FONT_FILE = "fonts/InterVariable.woff2"
+
+FONT_FACE = (
+    "@font-face{font-family:'Inter';font-style:normal;font-weight:300 700;"
+    "font-display:swap;src:local('Inter'),url(%s) format('woff2')}"
+)
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+@functools.lru_cache(maxsize=None)
+def build_stylesheet(static_dir=STATIC_DIR):
+    """Minify the source stylesheet into the static build file
+
+    Returns (minified_css, version, published). `published` is False when
+    the build file could not be written, e.g. on a read-only filesystem.
+    """
+    with open(os.path.join(static_dir, STYLESHEET_SOURCE), encoding="utf-8") as f:
+        css = minify_css(f.read())
+    if os.path.exists(os.path.join(static_dir, FONT_FILE)):
+        # Relative to the stylesheet, which is served from the same folder
+        css = FONT_FACE % FONT_FILE + css
+    version = hashlib.sha1(css.encode("utf-8")).hexdigest()[:10]
+
+    build_path = os.path.join(static_dir, STYLESHEET_BUILD)
+    try:
+        with open(build_path, encoding="utf-8") as f:
+            published = f.read() == css
+    except OSError:
+        published = False
+    if not published:
+        try:
+            tmp_path = f"{build_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(css)
+            os.replace(tmp_path, build_path)
+            published = True
+        except OSError:
+            published = False
+    return css, version, published
+
+
+def stylesheet_html(static_serving=True):
+    """Markup that applies the dashboard stylesheet
+
+    With static serving this is a ~70 byte import of the cache-busted file;
+    otherwise the minified CSS itself (without the bundled font).
+    """
+    css, version, published = build_stylesheet()
+    if static_serving and published and os.environ.get("CVI_INLINE_CSS") != "1":
+        return f'<style>@import url("{STATIC_URL}/{STYLESHEET_BUILD}?v={version}");</style>'
+    if css.startswith("@font-face"):
+        css = css[css.index("}") + 1:]
+    return f"<style>{css}</style>"
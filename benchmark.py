@@ -0,0 +1,253 @@
+"""Benchmarks for the load, lookup and render paths.
+
+Generates synthetic prediction datasets (1, 10 and 100 years of one market,
+and one year across many markets) in the partitioned `data/` layout, then
+times:
+
+- CSV parse (predictions + forecast decode) vs. cold cache build vs. cached load
+- `parse_multi_forecast` throughput
+- date lookup, history-window slicing and window aggregates on a PredictionStore
+- `create_volatility_timeline` / `create_cvi_trend_chart` at 7/30/60/365/1825 days
+- a full headless run of web.py with Streamlit's AppTest (fresh process)
+
+Results are written as JSON so runs can be compared:
+
+    python benchmark.py -o benchmark-results.json
+    python benchmark.py --years 1 10 --markets 10 --repeat 3
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# Benchmarks must not race a background reload thread
+os.environ.setdefault("CVI_WATCH_INTERVAL", "0")
+
+import numpy as np
+import pandas as pd
+
+from catalog import discover_partitions, load_partition
+from charts import create_cvi_trend_chart, create_volatility_timeline
+from forecasts import parse_multi_forecast
+from predictions import CACHE_DIR, read_forecasts, read_predictions
+from translations import translations
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LABELS = np.array(["Low", "Medium", "High"])
+MOVEMENTS = np.array(["Up", "Down", "Stable"])
+HORIZONS = (1, 3, 7)
+WINDOWS = (7, 30, 60, 365, 1825)
+
+
+def synthetic_predictions(start, days, seed=0):
+    """Prediction rows shaped like the real CSV, with a distinct forecast per day"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=days, freq="D")
+    proba = rng.dirichlet([4, 2, 1], size=days)
+    labels = LABELS[proba.argmax(axis=1)]
+    price = 2000 + np.cumsum(rng.normal(0, 20, days))
+    momentum = rng.normal(0, 3, (days, 2))
+    forecast_proba = rng.dirichlet([4, 2, 1], size=(days, len(HORIZONS)))
+
+    multi_next = []
+    for i, date in enumerate(dates):
+        payload = {}
+        for j, horizon in enumerate(HORIZONS):
+            p = forecast_proba[i, j]
+            payload[(date + pd.Timedelta(days=horizon)).strftime("%Y-%m-%d")] = {
+                "horizon_days": horizon, "proba": [float(x) for x in p],
+                "score": float(10 * p[2] + 5 * p[1]), "label": str(LABELS[p.argmax()]),
+            }
+        multi_next.append(repr(payload))
+
+    return pd.DataFrame({
+        "date": dates.strftime("%Y-%m-%d"),
+        "cvi_score": np.round(10 * proba[:, 2] + 5 * proba[:, 1], 3),
+        "cvi_label": labels,
+        "prob_low": np.round(proba[:, 0], 4),
+        "prob_med": np.round(proba[:, 1], 4),
+        "prob_high": np.round(proba[:, 2], 4),
+        "Modal_Price": np.round(price),
+        "price_momentum_7": momentum[:, 0],
+        "price_momentum_3": momentum[:, 1],
+        "vol_7": np.abs(rng.normal(0, 0.05, days)),
+        "vol_30": np.abs(rng.normal(0, 0.1, days)),
+        "price_movement": MOVEMENTS[rng.integers(0, 3, days)],
+        "multi_next": multi_next,
+    })
+
+
+def write_dataset(root, years, markets, commodity="onion", first_year=2000):
+    """Write `markets` partitions of `years` yearly CSV files under `root`"""
+    days = (pd.Timestamp(f"{first_year + years}-01-01") - pd.Timestamp(f"{first_year}-01-01")).days
+    for m in range(markets):
+        folder = os.path.join(root, commodity, f"market_{m:03d}")
+        os.makedirs(folder, exist_ok=True)
+        df = synthetic_predictions(f"{first_year}-01-01", days, seed=m)
+        for year, rows in df.groupby(df["date"].str[:4]):
+            rows.to_csv(os.path.join(folder, f"{year}.csv"), index=False)
+
+
+def clear_caches(root):
+    for folder, dirs, _ in os.walk(root):
+        if CACHE_DIR in dirs:
+            shutil.rmtree(os.path.join(folder, CACHE_DIR))
+            dirs.remove(CACHE_DIR)
+
+
+def measure(fn, repeat):
+    """Wall-clock seconds of `repeat` calls of `fn`"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def record(results, dataset, benchmark, times, **extra):
+    entry = {
+        "dataset": dataset,
+        "benchmark": benchmark,
+        "repeat": len(times),
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "max_s": max(times),
+        **extra,
+    }
+    results.append(entry)
+    print(f"{dataset:>10} {benchmark:<28} median {entry['median_s'] * 1000:10.3f} ms", file=sys.stderr)
+
+
+def bench_dataset(results, name, root, repeat):
+    partitions = discover_partitions(root)
+    all_files = [f for files in partitions.values() for f in files]
+    first_files = next(iter(partitions.values()))
+
+    def parse_csv():
+        for f in all_files:
+            read_predictions(f, use_cache=False)
+            read_forecasts(f, use_cache=False)
+
+    def load_all():
+        return [load_partition(files) for files in partitions.values()]
+
+    def cold_load():
+        clear_caches(root)
+        load_all()
+
+    record(results, name, "csv_parse", measure(parse_csv, repeat), files=len(all_files))
+    record(results, name, "cache_build", measure(cold_load, repeat), partitions=len(partitions))
+    record(results, name, "cached_load", measure(load_all, repeat), partitions=len(partitions))
+
+    texts = pd.concat([pd.read_csv(f, usecols=["multi_next"]) for f in first_files])["multi_next"].tolist()
+    times = measure(lambda: [parse_multi_forecast(text) for text in texts], repeat)
+    record(results, name, "parse_multi_forecast", times, items=len(texts),
+           items_per_s=len(texts) / statistics.median(times))
+
+    store = load_partition(first_files)
+    rng = np.random.default_rng(0)
+    dates = [d.date() for d in pd.to_datetime(rng.integers(store.first_day, store.last_day + 1, 10_000), unit="D")]
+    times = measure(lambda: [store.position(d) for d in dates], repeat)
+    record(results, name, "date_lookup", times, lookups=len(dates), per_lookup_s=statistics.median(times) / len(dates))
+    times = measure(lambda: [store.window(d, 30) for d in dates[:1000]], repeat)
+    record(results, name, "window_30d", times, lookups=1000, per_lookup_s=statistics.median(times) / 1000)
+    span = store.last_day - store.first_day
+    times = measure(lambda: [store.window_stats(d, span) for d in dates[:1000]], repeat)
+    record(results, name, "window_stats_full", times, lookups=1000, per_lookup_s=statistics.median(times) / 1000)
+
+    t = translations["English"]
+    current = store.max_date
+    for days in WINDOWS:
+        record(results, name, f"volatility_timeline_{days}d",
+               measure(lambda: create_volatility_timeline(store, current, days, t), repeat), days_back=days)
+        record(results, name, f"cvi_trend_chart_{days}d",
+               measure(lambda: create_cvi_trend_chart(store, current, days, t), repeat), days_back=days)
+
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--apptest", root, "--repeat", str(repeat)],
+        capture_output=True, text=True, cwd=HERE, env={**os.environ, "CVI_DATA_ROOT": root},
+    )
+    if output.returncode != 0:
+        print(output.stderr, file=sys.stderr)
+        raise RuntimeError(f"AppTest run failed for {name}")
+    for benchmark, times in json.loads(output.stdout.strip().splitlines()[-1]).items():
+        record(results, name, benchmark, times)
+
+
+def apptest_timings(repeat):
+    """Cold first run, then reruns on a new date, of web.py in this process"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(HERE, "web.py"), default_timeout=600)
+    start = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception)
+
+    picker = at.date_input(key="date_selector")
+    low, high = picker.min, picker.max
+    reruns = []
+    for i in range(repeat):
+        day = low + (high - low) * (i + 1) / (repeat + 1)
+        start = time.perf_counter()
+        at.date_input(key="date_selector").set_value(day).run()
+        reruns.append(time.perf_counter() - start)
+    print(json.dumps({"apptest_first_run": [first], "apptest_rerun": reruns}))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard's load, lookup and render paths.")
+    parser.add_argument("--years", nargs="+", type=int, default=[1, 10, 100],
+                        help="history lengths for the single-market datasets")
+    parser.add_argument("--markets", type=int, default=50,
+                        help="markets in the one-year many-market dataset (0 to skip)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", default="benchmark-results.json")
+    parser.add_argument("--keep", help="write the synthetic data here and keep it")
+    parser.add_argument("--apptest", metavar="ROOT", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.apptest:
+        apptest_timings(args.repeat)
+        return
+
+    datasets = [(f"{years}y", years, 1) for years in args.years]
+    if args.markets:
+        datasets.append((f"{args.markets}markets", 1, args.markets))
+
+    work = args.keep or tempfile.mkdtemp(prefix="cvi-bench-")
+    results = []
+    try:
+        for name, years, markets in datasets:
+            root = os.path.join(work, name)
+            if not os.path.isdir(root):
+                write_dataset(root, years, markets)
+            bench_dataset(results, name, root, args.repeat)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work, ignore_errors=True)
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Bulk advisory export for SMS broadcast.
+
+Writes the advisory (title, message, action) and the decision-guide cell for
+every date, partition and language as JSONL or CSV:
+
+    python broadcast.py --from 2025-12-01 --to 2025-12-31 --lang en mr -o december.jsonl
+    python broadcast.py --partition onion/lasalgaon --format csv > lasalgaon.csv
+
+Each partition is classified in one vectorised pass (see
+`advisory.classify_situations`). Advisory and decision text come from small
+lookup tables keyed by the distinct label combinations and are merged onto
+the date range, so cost grows with the number of partitions, not with
+per-row Python calls. Partitions are written one at a time so memory stays
+bounded.
+"""
+import argparse
+import sys
+from datetime import date
+
+import pandas as pd
+
+from advisory import alert_risk_levels, classify_situations, get_advisory, price_movements, volatility_levels
+from catalog import Catalog
+from translations import LANGUAGE_CODES, resolve_language, translations
+
+OUTPUT_COLUMNS = [
+    "commodity", "market", "date", "language",
+    "volatility", "price_movement", "alert_risk",
+    "title", "message", "action", "color",
+    "situation", "decision", "decision_color",
+]
+
+
+def advisory_frame(store, start=None, end=None, languages=None, commodity="", market=""):
+    """One row per (date, language) with the advisory and decision-guide text"""
+    languages = list(languages or translations)
+    start = store.min_date if start is None else start
+    end = store.max_date if end is None else end
+    rows = store.window(end, (pd.Timestamp(end) - pd.Timestamp(start)).days)
+    if rows.empty:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+    dates = rows["date"].to_numpy()
+    frame = pd.DataFrame({
+        "date": pd.DatetimeIndex(dates).strftime("%Y-%m-%d"),
+        "volatility": volatility_levels(rows["cvi_label"]),
+        "price_movement": price_movements(rows["price_movement"]),
+        "alert_risk": alert_risk_levels(store.forecasts, dates),
+    })
+
+    cells = classify_situations(frame["volatility"], frame["alert_risk"])
+    frame = frame.join(cells.rename(columns={"action_color": "decision_color"}))
+    pairs = frame[["volatility", "price_movement"]].drop_duplicates()
+
+    parts = []
+    for language in languages:
+        t = translations[language]
+        text = pairs.copy()
+        advisories = [get_advisory(v, m, language) for v, m in zip(text["volatility"], text["price_movement"])]
+        for field in ("title", "message", "action", "color"):
+            text[field] = [a[field] for a in advisories]
+        part = frame.merge(text, on=["volatility", "price_movement"], how="left", sort=False)
+        part["situation"] = part["situation_key"].map(t)
+        part["decision"] = part["action_key"].map(t)
+        part["language"] = language
+        parts.append(part)
+
+    result = pd.concat(parts, ignore_index=True)
+    result["commodity"] = commodity
+    result["market"] = market
+    return result[OUTPUT_COLUMNS]
+
+
+def parse_partition(value):
+    commodity, _, market = value.partition("/")
+    return commodity, market
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export daily advisories for SMS broadcast.")
+    parser.add_argument("--from", dest="start", type=date.fromisoformat,
+                        help="first date (YYYY-MM-DD), default: start of each partition")
+    parser.add_argument("--to", dest="end", type=date.fromisoformat,
+                        help="last date (YYYY-MM-DD), default: end of each partition")
+    parser.add_argument("--partition", action="append", type=parse_partition, metavar="COMMODITY/MARKET",
+                        help="partition to export, repeatable (default: all)")
+    parser.add_argument("--lang", nargs="+", default=sorted(LANGUAGE_CODES),
+                        help="language codes or names (default: all)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    languages = [resolve_language(code) for code in args.lang]
+    if None in languages:
+        sys.exit(f"Unsupported language; use one of {sorted(LANGUAGE_CODES)}")
+
+    catalog = Catalog()
+    partitions = args.partition or list(catalog.partitions)
+    unknown = [f"{c}/{m}" for c, m in partitions if (c, m) not in catalog.partitions]
+    if unknown:
+        sys.exit(f"Unknown partition: {', '.join(unknown)}")
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        header = True
+        for commodity, market in partitions:
+            store = catalog.load(commodity, market)
+            frame = advisory_frame(store, args.start, args.end, languages, commodity, market)
+            if frame.empty:
+                continue
+            if args.format == "csv":
+                frame.to_csv(out, index=False, header=header)
+                header = False
+            else:
+                # Line-delimited output already ends with a newline
+                frame.to_json(out, orient="records", lines=True, force_ascii=False)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""Catalogue of partitioned prediction datasets.
+
+Predictions for many commodities and APMC markets are laid out on disk as
+
+    data/<commodity>/<market>/<year>.csv
+
+Only directory names are read up front. A (commodity, market) partition is
+loaded the first time someone views it, and the loaded stores are kept in a
+small LRU so memory follows what users look at, not the catalogue size.
+When no partitioned layout exists the single legacy CSV is served as the
+only partition.
+
+Each access compares the partition's file sizes and mtimes with the loaded
+version. Rows appended since then are parsed into a new store that shares
+the old one's index and replaces it in the LRU, so live sessions see new
+data on their next rerun while a run in progress keeps its snapshot.
+
+`Catalog.watch()` moves that check to a background thread. The thread polls
+the data directory, reloads each changed partition still in the LRU once
+per process and swaps it in under the catalogue lock. Page reruns then skip
+the file checks and just read the current store.
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from predictions import (appended_tail, apply_schema, cache_path_for, load_published, read_forecasts,
+                         read_predictions, source_version)
+from store import PredictionStore
+
+DATA_ROOT = os.environ.get("CVI_DATA_ROOT", "data")
+DEFAULT_FILE = "2025_predictions.csv"
+PARTITION_CACHE_SIZE = int(os.environ.get("CVI_PARTITION_CACHE_SIZE", "8"))
+WATCH_INTERVAL = float(os.environ.get("CVI_WATCH_INTERVAL", "5"))
+
+logger = logging.getLogger(__name__)
+
+
+def discover_partitions(root):
+    """Map (commodity, market) to its sorted list of CSV files under `root`"""
+    partitions = {}
+    if not os.path.isdir(root):
+        return partitions
+    for commodity in sorted(os.scandir(root), key=lambda e: e.name):
+        if not commodity.is_dir() or commodity.name.startswith('.'):
+            continue
+        for market in sorted(os.scandir(commodity.path), key=lambda e: e.name):
+            if not market.is_dir() or market.name.startswith('.'):
+                continue
+            files = sorted(
+                entry.path for entry in os.scandir(market.path)
+                if entry.is_file() and entry.name.endswith('.csv')
+            )
+            if files:
+                partitions[(commodity.name, market.name)] = files
+    return partitions
+
+
+def display_name(name):
+    """Human readable label for a commodity or market directory name"""
+    return name.replace('_', ' ').replace('-', ' ').title()
+
+
+def combine_predictions(files):
+    """(predictions of all `files`, the (size, sha256) each was read at)"""
+    frames, sources = zip(*(read_predictions(f, with_source=True) for f in files))
+    return apply_schema(pd.concat(frames, ignore_index=True)), dict(zip(files, sources))
+
+
+def combine_forecasts(files):
+    """(forecast table of all `files`, the (size, sha256) each was read at)"""
+    tables, sources = zip(*(read_forecasts(f, with_source=True) for f in files))
+    forecasts = pd.concat(tables, ignore_index=True)
+    forecasts['label'] = forecasts['label'].astype('category')
+    forecasts = forecasts.sort_values(['source_date', 'target_date'], kind='stable').reset_index(drop=True)
+    return forecasts, dict(zip(files, sources))
+
+
+def load_partition(files):
+    """Build a PredictionStore from the year files of one partition
+
+    `sources` records the file states the frames were actually read at. If
+    another process appended to a file between the prediction and forecast
+    reads, the two disagree; the store then gets no sources and is fully
+    reloaded on the next change rather than extended from a wrong offset.
+    """
+    version = source_version(files)
+    if len(files) == 1:
+        df, df_source = read_predictions(files[0], with_source=True)
+        forecasts, forecast_source = read_forecasts(files[0], with_source=True)
+        df_sources, forecast_sources = {files[0]: df_source}, {files[0]: forecast_source}
+    else:
+        # The combined year files are published once per version for all workers
+        partition = os.path.join(os.path.dirname(files[0]), "partition")
+        df, df_sources = load_published(cache_path_for(partition), version, lambda: combine_predictions(files))
+        forecasts, forecast_sources = load_published(cache_path_for(partition, "forecasts"), version,
+                                                     lambda: combine_forecasts(files))
+    sources = df_sources if df_sources == forecast_sources else None
+    return PredictionStore(df, forecasts, version, sources)
+
+
+def extend_partition(store, files, version):
+    """`store` with the rows appended to the partition's files, or None if a reload is needed"""
+    if store.sources is None or set(store.sources) != set(files):
+        return None
+    sources = dict(store.sources)
+    tails = {}
+    for path in files:
+        tail = appended_tail(path, *sources[path])
+        if tail is None:
+            return None
+        rows, size, sha256 = tail
+        sources[path] = (size, sha256)
+        if len(rows):
+            tails[path] = rows
+    if tails:
+        rows = apply_schema(pd.concat(list(tails.values()), ignore_index=True))
+    else:
+        rows = store.frame.iloc[:0]
+    store = store.extended(rows, version, sources)
+    if store is None:
+        return None
+    # Bring the on-disk caches up to date for the next process start
+    for path in tails:
+        read_predictions(path)
+        read_forecasts(path)
+    return store
+
+
+class Catalog:
+    """Lazily loaded, LRU-cached prediction partitions"""
+
+    def __init__(self, root=DATA_ROOT, default_file=DEFAULT_FILE, max_loaded=PARTITION_CACHE_SIZE):
+        self.root = root
+        self.default_file = default_file
+        self.max_loaded = max(1, max_loaded)
+        self.partitions = self._discover()
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._watcher = None
+        self._stop = None
+
+    def _discover(self):
+        return discover_partitions(self.root) or {("", ""): [self.default_file]}
+
+    @property
+    def is_partitioned(self):
+        return len(self.partitions) > 1 or ("", "") not in self.partitions
+
+    @property
+    def default_partition(self):
+        return next(iter(self.partitions))
+
+    def commodities(self):
+        return list(dict.fromkeys(commodity for commodity, _ in self.partitions))
+
+    def markets(self, commodity):
+        return [market for c, market in self.partitions if c == commodity]
+
+    def load(self, commodity, market):
+        """PredictionStore for a partition, loading it on first use"""
+        key = (commodity, market)
+        with self._lock:
+            store = self._loaded.get(key)
+            if store is not None:
+                self._loaded.move_to_end(key)
+        if store is not None:
+            # With a watcher running the store is already current
+            store = store if self._watcher is not None else self._refresh(key, store)
+        if store is not None:
+            return store
+        if key not in self.partitions:
+            raise KeyError(f"Unknown partition: {commodity}/{market}")
+
+        store = load_partition(self.partitions[key])
+        with self._lock:
+            self._loaded[key] = store
+            self._loaded.move_to_end(key)
+            self._evict()
+        return store
+
+    def _evict(self):
+        """Drop least recently used stores above `max_loaded`; call with the lock held"""
+        while len(self._loaded) > self.max_loaded:
+            self._loaded.popitem(last=False)
+
+    def _refresh(self, key, store):
+        """Current store for `key`: `store`, or a new one with appended rows or reloaded files
+
+        Stores are never modified; the new one is swapped in under the lock,
+        so sessions holding the old store keep a consistent snapshot. Returns
+        None if `key` was evicted meanwhile, so nobody reloads a partition
+        that is no longer cached.
+        """
+        files = self.partitions[key]
+        version = source_version(files)
+        if version == store.version:
+            return store
+        with self._refresh_lock:
+            with self._lock:
+                current = self._loaded.get(key)
+            if current is None:
+                return None
+            if version == current.version:
+                return current
+            store = extend_partition(current, files, version) or load_partition(files)
+            with self._lock:
+                # Keep its LRU position; if it was evicted during the reload, don't re-add it
+                if key in self._loaded:
+                    self._loaded[key] = store
+                    self._evict()
+        return store
+
+    def poll(self):
+        """Pick up added, removed and changed data files once"""
+        partitions = self._discover()
+        if partitions != self.partitions:
+            self.partitions = partitions
+        with self._lock:
+            loaded = list(self._loaded.items())
+        for key, store in loaded:
+            if key not in partitions:
+                with self._lock:
+                    self._loaded.pop(key, None)
+                continue
+            try:
+                self._refresh(key, store)
+            except OSError:
+                # File mid-replace; the next poll sees the finished version
+                continue
+
+    def watch(self, interval=WATCH_INTERVAL):
+        """Poll the data files every `interval` seconds in a daemon thread"""
+        if interval <= 0 or self._watcher is not None:
+            return
+        self._stop = threading.Event()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval, self._stop), name="catalog-watcher", daemon=True,
+        )
+        self._watcher.start()
+
+    def stop_watching(self):
+        """Stop the watcher thread; loads go back to checking the files themselves"""
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher = None
+
+    def _watch(self, interval, stop):
+        while not stop.wait(interval):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Reloading prediction data failed")
@@ -0,0 +1,326 @@
+"""Plotly figure builders for the dashboard, with a memoised history cache.
+
+The two history charts depend only on the dataset version, the end date,
+the window length and the language. `history_figure` keys on exactly that
+and keeps a bounded LRU of built figures, so repeated reruns with the same
+inputs skip rebuilding them. Windows longer
+than `lod.MAX_CHART_POINTS` days are drawn from reduced data (see `lod`).
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.graph_objects as go
+
+from lod import MAX_CHART_POINTS, label_runs, lttb
+from profiling import timed
+from store import to_day
+from translations import translations
+
+FIGURE_CACHE_SIZE = int(os.environ.get("CVI_FIGURE_CACHE_SIZE", "256"))
+# Timeline level -> label, for segments drawn from label runs
+RUN_LABELS = {1: 'Low', 2: 'Med', 3: 'High'}
+
+
+@timed
+def create_volatility_timeline(store, current_date, days_back=30, t=None):
+    """Create volatility timeline chart"""
+    if t is None:
+        t = translations["English"]
+    
+    timeline_df = store.window(current_date, days_back).copy()
+    
+    label_map = {'Low': 1, 'Med': 2, 'Medium': 2, 'High': 3}
+    timeline_df['volatility_numeric'] = timeline_df['cvi_label'].map(label_map).astype(float)
+    
+    fig = go.Figure()
+    
+    colors = {'Low': '#10b981', 'Med': '#f59e0b', 'Medium': '#f59e0b', 'High': '#ef4444'}
+    
+    if len(timeline_df) > MAX_CHART_POINTS:
+        _add_label_run_traces(fig, store, timeline_df, colors, t)
+        groups = ()
+    else:
+        # One pass over the window, groups in order of first appearance
+        groups = timeline_df.groupby('cvi_label', observed=True, sort=False)
+    for label, data in groups:
+        if not data.empty:
+            label_key = label.lower() if label.lower() in ['low', 'high'] else 'med'
+            volatility_label = t[f'{label_key}_volatility']
+            fig.add_trace(go.Scatter(
+                x=data['date'],
+                y=data['volatility_numeric'],
+                mode='markers+lines',
+                name=volatility_label,
+                marker=dict(size=10, color=colors.get(label, '#6366f1')),
+                line=dict(color=colors.get(label, '#6366f1'), width=3),
+                hovertemplate=f'<b>{volatility_label}</b><br>Date: %{{x|%b %d}}<br>CVI: %{{customdata:.4f}}<extra></extra>',
+                customdata=data['cvi_score']
+            ))
+    
+    fig.update_layout(
+        title=f"{days_back}-{t['days']} {t['historical_trends']}",
+        xaxis_title=t['date_range'],
+        yaxis_title=t['market_volatility'],
+        height=400,
+        paper_bgcolor='rgba(0, 0, 0, 0.3)',
+        plot_bgcolor='rgba(0, 0, 0, 0.2)',
+        font={'family': 'Inter', 'size': 12, 'color': 'white'},
+        hovermode='closest',
+        yaxis=dict(
+            tickmode='array',
+            tickvals=[1, 2, 3],
+            ticktext=['Low', 'Medium', 'High'],
+            gridcolor='rgba(255, 255, 255, 0.1)',
+            color='white'
+        ),
+        xaxis=dict(
+            gridcolor='rgba(255, 255, 255, 0.1)',
+            color='white'
+        ),
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            font={'color': 'white'}
+        ),
+        title_font={'color': 'white'}
+    )
+    return fig
+
+
+def _add_label_run_traces(fig, store, timeline_df, colors, t):
+    """One segment per run of equal labels, with the run's length and mean CVI on hover"""
+    # Three points per run: start, end and a gap
+    starts, ends, levels = label_runs(timeline_df['volatility_numeric'], MAX_CHART_POINTS // 3)
+    dates = timeline_df['date'].to_numpy()
+    # The window is a contiguous slice of the store, so its prefix sums give each run's mean
+    first = timeline_df.index[0]
+    sums = store.score_sums[first + ends] - store.score_sums[first + starts]
+    counts = store.score_counts[first + ends] - store.score_counts[first + starts]
+    means = np.divide(sums, counts, out=np.full(len(sums), np.nan), where=counts > 0)
+    # A run covers its days up to the start of the next one
+    run_end = np.append(dates[ends[:-1]], dates[-1] + np.timedelta64(1, 'D'))
+
+    for level, label in RUN_LABELS.items():
+        mask = levels == level
+        count = int(mask.sum())
+        if not count:
+            continue
+        x = np.empty(3 * count, dtype=object)
+        x[0::3], x[1::3], x[2::3] = dates[starts[mask]], run_end[mask], None
+        y = np.tile([level, level, None], count)
+        customdata = np.full((3 * count, 2), None, dtype=object)
+        for i in (0, 1):
+            customdata[i::3, 0] = (ends[mask] - starts[mask]).tolist()
+            customdata[i::3, 1] = means[mask].tolist()
+        volatility_label = t[f'{label.lower()}_volatility']
+        fig.add_trace(go.Scatter(
+            x=x,
+            y=y,
+            mode='lines',
+            name=volatility_label,
+            line=dict(color=colors[label], width=8),
+            hovertemplate=(f'<b>{volatility_label}</b><br>Date: %{{x|%b %d, %Y}}<br>'
+                           f"%{{customdata[0]}} {t['days']}<br>CVI: %{{customdata[1]:.4f}}<extra></extra>"),
+            customdata=customdata,
+        ))
+
+
+@timed
+def create_cvi_trend_chart(store, current_date, days_back=30, t=None):
+    """Create CVI score trend chart"""
+    if t is None:
+        t = translations["English"]
+    trend_df = store.window(current_date, days_back)
+    mode = 'lines+markers'
+    if len(trend_df) > MAX_CHART_POINTS:
+        trend_df = trend_df[trend_df['cvi_score'].notna()]
+        days = trend_df['date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        trend_df = trend_df.iloc[lttb(days, trend_df['cvi_score'].to_numpy())]
+        mode = 'lines'
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=trend_df['date'],
+        y=trend_df['cvi_score'],
+        mode=mode,
+        name=t['cvi_score'],
+        line=dict(color='#667eea', width=3),
+        marker=dict(size=8, color='#764ba2'),
+        fill='tozeroy',
+        fillcolor='rgba(102, 126, 234, 0.2)',
+        hovertemplate=f"<b>{t['cvi_score']}</b><br>Date: %{{x|%b %d}}<br>Score: %{{y:.4f}}<extra></extra>"
+    ))
+
+    fig.add_hline(y=33, line_dash="dash", line_color="#10b981",
+                  annotation_text=f"{t['low']} Threshold", annotation_position="right")
+    fig.add_hline(y=66, line_dash="dash", line_color="#f59e0b",
+                  annotation_text=f"{t['high']} Threshold", annotation_position="right")
+
+    fig.update_layout(
+        title=f"{days_back}-{t['days']} {t['cvi_score']} {t['price_trend']}",
+        xaxis_title=t['date_range'],
+        yaxis_title=t['cvi_score'],
+        height=400,
+        paper_bgcolor='rgba(0, 0, 0, 0.3)',
+        plot_bgcolor='rgba(0, 0, 0, 0.2)',
+        font={'family': 'Inter', 'size': 12, 'color': 'white'},
+        hovermode='x unified',
+        xaxis=dict(
+            gridcolor='rgba(255, 255, 255, 0.1)',
+            color='white'
+        ),
+        yaxis=dict(
+            gridcolor='rgba(255, 255, 255, 0.1)',
+            color='white'
+        )
+    )
+
+    return fig
+
+
+@timed
+def create_momentum_chart(m7, m3, vol7, vol30, windows=(7, 3, 7, 30)):
+    """Create price momentum comparison chart; `windows` are the day counts behind each bar"""
+    fig = go.Figure()
+    
+    kinds = ['Momentum', 'Momentum', 'Volatility', 'Volatility']
+    categories = [f'{days}-Day<br>{kind}' for days, kind in zip(windows, kinds)]
+    values = [m7, m3, vol7, vol30]
+    colors = ['#10b981' if v >= 0 else '#ef4444' for v in values]
+    
+    fig.add_trace(go.Bar(
+        x=categories,
+        y=values,
+        marker_color=colors,
+        text=[f"{v:+.2f}%" for v in values],
+        textposition='outside',
+        textfont=dict(color='white'),
+        hovertemplate='<b>%{x}</b><br>Value: %{y:.2f}%<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title="Price Momentum & Volatility Indicators",
+        xaxis_title="Indicator",
+        yaxis_title="Percentage (%)",
+        height=400,
+        paper_bgcolor='rgba(0, 0, 0, 0.3)',
+        plot_bgcolor='rgba(0, 0, 0, 0.2)',
+        font={'family': 'Inter', 'size': 12, 'color': 'white'},
+        xaxis=dict(
+            gridcolor='rgba(255, 255, 255, 0.1)',
+            color='white'
+        ),
+        yaxis=dict(
+            gridcolor='rgba(255, 255, 255, 0.1)',
+            color='white'
+        ),
+        title_font={'color': 'white'}
+    )
+    
+    fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
+    
+    return fig
+
+
+GAUGE_COLORS = ['#10b981', '#f59e0b', '#ef4444']
+GAUGE_STEPS = [
+    {'range': [0, 33], 'color': 'rgba(16, 185, 129, 0.2)'},
+    {'range': [33, 66], 'color': 'rgba(245, 158, 11, 0.2)'},
+    {'range': [66, 100], 'color': 'rgba(239, 68, 68, 0.2)'}
+]
+
+# Shared styling for every gauge panel. A small explicit template replaces
+# plotly's default one, which is most of the JSON of a single-gauge figure.
+GAUGE_TEMPLATE = go.layout.Template(
+    layout=dict(
+        paper_bgcolor='rgba(0, 0, 0, 0.3)',
+        font={'family': 'Inter', 'color': 'white'},
+    ),
+    data=dict(indicator=[go.Indicator(
+        mode="gauge+number",
+        number={'suffix': "%", 'font': {'color': 'white'}},
+        title={'font': {'color': 'white'}},
+        gauge={
+            'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': 'white'},
+            'bgcolor': "rgba(0, 0, 0, 0.2)",
+            'borderwidth': 2,
+            'bordercolor': "rgba(255, 255, 255, 0.2)",
+        },
+    )]),
+)
+
+GAUGE_STYLES = {
+    "detail": dict(height=280, title_size=18, number_size=36, thickness=0.8,
+                   steps=GAUGE_STEPS, margin=dict(l=10, r=10, t=50, b=10)),
+    "compact": dict(height=200, title_size=14, number_size=24, thickness=0.75,
+                    steps=None, margin=dict(l=10, r=10, t=40, b=10)),
+}
+
+
+@timed
+def create_gauge_panel(probabilities, labels, style="detail", colors=GAUGE_COLORS):
+    """Draw a row of probability gauges as a single figure
+
+    `probabilities` are fractions (0-1), one gauge per entry, laid out side
+    by side using indicator domains.
+    """
+    spec = GAUGE_STYLES[style]
+    count = len(probabilities)
+    gap = 0.03
+
+    fig = go.Figure()
+    for idx, (prob, label, color) in enumerate(zip(probabilities, labels, colors)):
+        gauge = {'bar': {'color': color, 'thickness': spec['thickness']}}
+        if spec['steps']:
+            gauge['steps'] = spec['steps']
+        fig.add_trace(go.Indicator(
+            value=prob * 100,
+            domain={'x': [idx / count + gap, (idx + 1) / count - gap], 'y': [0, 1]},
+            title={'text': label, 'font': {'size': spec['title_size']}},
+            number={'font': {'size': spec['number_size']}},
+            gauge=gauge,
+        ))
+
+    fig.update_layout(
+        template=GAUGE_TEMPLATE,
+        height=spec['height'],
+        margin=spec['margin'],
+    )
+    return fig
+
+
+HISTORY_CHARTS = {
+    "timeline": create_volatility_timeline,
+    "cvi_trend": create_cvi_trend_chart,
+}
+
+_figure_cache = OrderedDict()
+_figure_lock = threading.Lock()
+
+
+def history_figure(kind, store, current_date, days_back=30, language="English"):
+    """Memoised history chart figure
+
+    `kind` is one of HISTORY_CHARTS. Entries are keyed on the store's
+    dataset version, so a reloaded dataset never serves stale figures.
+    """
+    key = (kind, store.version, to_day(current_date), int(days_back), language)
+    with _figure_lock:
+        if key in _figure_cache:
+            _figure_cache.move_to_end(key)
+            return _figure_cache[key]
+
+    fig = HISTORY_CHARTS[kind](store, current_date, days_back, translations[language])
+    with _figure_lock:
+        _figure_cache[key] = fig
+        _figure_cache.move_to_end(key)
+        while len(_figure_cache) > FIGURE_CACHE_SIZE:
+            _figure_cache.popitem(last=False)
+    return fig
@@ -0,0 +1,117 @@
+"""Rolling momentum and volatility computed from the modal price series.
+
+The prediction CSVs ship `price_momentum_7`, `price_momentum_3`, `vol_7` and
+`vol_30` precomputed by the offline pipeline. The same features can be
+derived here, for any window length, from the price column itself:
+
+- daily log returns, with 0 for the first row and next to missing prices,
+- momentum over `w` rows is the sum of the last `w` returns (the log price
+  change), over however many rows exist at the start,
+- volatility over `w` rows is the sample standard deviation of those
+  returns, 0 until at least `max(3, w // 4)` rows are in the window.
+
+These match the pipeline's columns exactly. Every window statistic is the
+difference of two prefix sums (of the returns and of their squares), so a
+series costs O(n) for any window length.
+"""
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ["Modal_Price", "modal_price", "market_price"]
+DEFAULT_MOMENTUM_WINDOWS = (7, 3)
+DEFAULT_VOLATILITY_WINDOWS = (7, 30)
+MAX_WINDOW = 365
+
+
+def momentum_column(window):
+    return f"price_momentum_{window}"
+
+
+def volatility_column(window):
+    return f"vol_{window}"
+
+
+def price_column(frame):
+    """Name of the first price column with any values in `frame`, or None"""
+    for col in PRICE_COLUMNS:
+        if col in frame.columns and frame[col].notna().any():
+            return col
+    return None
+
+
+def log_returns(prices):
+    """Daily log returns; 0 for the first row and around missing or non-positive prices"""
+    prices = np.asarray(prices, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        logs = np.where(prices > 0, np.log(prices), np.nan)
+    returns = np.empty_like(logs)
+    returns[:1] = 0.0
+    returns[1:] = np.diff(logs)
+    return np.nan_to_num(returns, nan=0.0)
+
+
+def _window_sums(values, window):
+    """Sum of the last `window` values at every position, from one prefix sum"""
+    prefix = np.concatenate([[0.0], np.cumsum(values)])
+    end = np.arange(1, len(values) + 1)
+    return prefix[end] - prefix[np.maximum(end - window, 0)]
+
+
+def rolling_momentum(prices, window):
+    """Log price change over the last `window` rows, as float32"""
+    return _window_sums(log_returns(prices), window).astype(np.float32)
+
+
+def min_volatility_periods(window):
+    return max(3, window // 4)
+
+
+def rolling_volatility(prices, window):
+    """Sample std of the log returns over the last `window` rows, as float32"""
+    returns = log_returns(prices)
+    # Centre before squaring so the prefix sums stay well conditioned on long series
+    centred = returns - returns.mean() if len(returns) else returns
+    n = np.minimum(np.arange(1, len(returns) + 1), window).astype(np.float64)
+    s1 = _window_sums(centred, window)
+    s2 = _window_sums(centred * centred, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = (s2 - s1 * s1 / n) / (n - 1)
+    ok = (n >= min(min_volatility_periods(window), window)) & (n > 1)
+    return np.sqrt(np.where(ok, np.maximum(var, 0.0), 0.0)).astype(np.float32)
+
+
+ROLLING_FEATURES = {"momentum": rolling_momentum, "volatility": rolling_volatility}
+
+
+def price_feature(frame, kind, window):
+    """One "momentum" or "volatility" column for a date-sorted frame, or None without a price column"""
+    col = price_column(frame)
+    if col is None:
+        return None
+    return ROLLING_FEATURES[kind](frame[col].to_numpy(dtype=np.float64), window)
+
+
+def price_features(frame, momentum_windows=DEFAULT_MOMENTUM_WINDOWS,
+                   volatility_windows=DEFAULT_VOLATILITY_WINDOWS):
+    """Momentum and volatility columns for a date-sorted frame, or None without a price column"""
+    col = price_column(frame)
+    if col is None:
+        return None
+    prices = frame[col].to_numpy(dtype=np.float64)
+    features = {momentum_column(w): rolling_momentum(prices, w) for w in momentum_windows}
+    features.update({volatility_column(w): rolling_volatility(prices, w) for w in volatility_windows})
+    return pd.DataFrame(features, index=frame.index)
+
+
+def fill_price_features(frame):
+    """Add the default feature columns `frame` is missing, in place; returns their names"""
+    missing = [momentum_column(w) for w in DEFAULT_MOMENTUM_WINDOWS if momentum_column(w) not in frame.columns]
+    missing += [volatility_column(w) for w in DEFAULT_VOLATILITY_WINDOWS if volatility_column(w) not in frame.columns]
+    if not missing:
+        return []
+    features = price_features(frame)
+    if features is None:
+        return []
+    for col in missing:
+        frame[col] = features[col]
+    return missing
@@ -0,0 +1,119 @@
+"""Decoding of the `multi_next` column into a flat forecast table.
+
+Each row of the predictions file carries its multi-step forecast as a Python
+dict literal. Most rows share the exact same text, so every distinct payload
+is parsed once and the results are expanded into a long table with one row
+per (source_date, target_date). Renders then slice that table by date and
+never touch `ast.literal_eval`.
+"""
+import ast
+
+import numpy as np
+import pandas as pd
+
+FORECAST_COLUMNS = [
+    "source_date", "target_date", "horizon_days",
+    "proba_low", "proba_med", "proba_high", "score", "label",
+]
+
+# Shortest horizon that gets a forecast card on the dashboard
+MIN_CARD_HORIZON = 3
+
+
+def parse_multi_forecast(multi_next_str):
+    """Parse the multi_next column string into a dictionary"""
+    try:
+        if pd.isna(multi_next_str):
+            return None
+        # Convert string representation to dictionary
+        forecast_dict = ast.literal_eval(multi_next_str)
+        return forecast_dict
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        return None
+
+
+def _payload_records(forecast_dict):
+    """Flatten one parsed payload into (target, horizon, pl, pm, ph, score, label) tuples"""
+    if not isinstance(forecast_dict, dict):
+        return []
+    records = []
+    for date_str in sorted(forecast_dict):
+        info = forecast_dict[date_str]
+        proba = list(info.get('proba', [np.nan] * 3)) + [np.nan] * 3
+        records.append((
+            date_str,
+            info.get('horizon_days', -1),
+            proba[0], proba[1], proba[2],
+            info.get('score', np.nan),
+            info.get('label'),
+        ))
+    return records
+
+
+def build_forecast_table(df):
+    """Decode `df['multi_next']` into the long forecast table, sorted by source date"""
+    if 'multi_next' not in df.columns:
+        df = df.assign(multi_next=None)
+
+    # Intern payloads: each distinct string is parsed exactly once
+    codes, uniques = pd.factorize(df['multi_next'], use_na_sentinel=True)
+    payloads = [_payload_records(parse_multi_forecast(text)) for text in uniques]
+    lengths = np.array([len(p) for p in payloads] + [0], dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(lengths[:-1])])
+    records = [r for p in payloads for r in p]
+
+    # Expand payload records to one block per source row
+    codes = np.where(codes < 0, len(payloads), codes)
+    counts = lengths[codes]
+    total = int(counts.sum())
+    row_of = np.repeat(np.arange(len(df)), counts)
+    within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    take = starts[codes][row_of] + within
+
+    unique_table = pd.DataFrame.from_records(
+        records,
+        columns=["target_date", "horizon_days", "proba_low", "proba_med",
+                 "proba_high", "score", "label"],
+    )
+    table = unique_table.iloc[take].reset_index(drop=True)
+    table.insert(0, "source_date", pd.to_datetime(df['date']).to_numpy()[row_of])
+    table["target_date"] = pd.to_datetime(table["target_date"])
+
+    horizon = table["horizon_days"].to_numpy(dtype=np.int64)
+    missing = horizon < 0
+    if missing.any():
+        gap = (table["target_date"] - table["source_date"]).dt.days.to_numpy()
+        horizon = np.where(missing, gap, horizon)
+    table["horizon_days"] = horizon.astype(np.int16)
+
+    for col in ["proba_low", "proba_med", "proba_high", "score"]:
+        table[col] = table[col].astype(np.float32)
+    table["label"] = table["label"].astype("category")
+
+    return table.sort_values(["source_date", "target_date"], kind="stable").reset_index(drop=True)
+
+
+def forecasts_for(forecasts, date):
+    """Rows of the forecast table issued on `date` (binary search on source_date)"""
+    source = forecasts["source_date"].to_numpy()
+    key = np.datetime64(pd.Timestamp(date)).astype(source.dtype)
+    lo = np.searchsorted(source, key, side="left")
+    hi = np.searchsorted(source, key, side="right")
+    return forecasts.iloc[lo:hi]
+
+
+def latest_forecast_run(forecasts):
+    """One row per target date of the most recent forecast run, or None
+
+    A forecast's origin is its target date minus its horizon, i.e. the last
+    observed date it was made from. The run with the latest origin is kept,
+    with an `origin_date` column, sorted by target date.
+    """
+    if forecasts is None or forecasts.empty:
+        return None
+    horizon = pd.to_timedelta(forecasts["horizon_days"].to_numpy(dtype=np.int64), unit="D")
+    origin = forecasts["target_date"] - horizon
+    run = forecasts[origin == origin.max()].assign(origin_date=origin.max())
+    return (run.drop_duplicates("target_date", keep="last")
+               .sort_values("target_date", kind="stable")
+               .reset_index(drop=True))
@@ -0,0 +1,93 @@
+"""Lite rendering for slow connections and low-end phones.
+
+In lite mode the page draws no Plotly figures, so the browser never
+fetches or runs the Plotly bundle:
+
+- probability gauges become plain HTML/CSS bars,
+- the two history charts become one small SVG sparkline built on the
+  server (CVI score over a strip of label colours),
+- the momentum bar chart is skipped; its numbers stay as metrics.
+
+It is toggled in the sidebar, forced with `?lite=1` / `?lite=0`, and on by
+default when the browser sends `Save-Data: on` or a 2G/3G `ECT` client hint.
+"""
+import html
+
+import numpy as np
+
+from lod import label_runs, lttb
+
+SLOW_CONNECTIONS = {"slow-2g", "2g", "3g"}
+BAR_COLORS = ['#10b981', '#f59e0b', '#ef4444']
+LEVEL_COLORS = {1: '#10b981', 2: '#f59e0b', 3: '#ef4444'}
+SPARKLINE_WIDTH = 320
+SPARKLINE_HEIGHT = 72
+SPARKLINE_POINTS = 120
+STRIP_HEIGHT = 6
+
+
+def prefers_lite(headers, query_params):
+    """Default for the lite toggle from the URL and the request's data-saving hints"""
+    forced = query_params.get("lite")
+    if forced in ("0", "1"):
+        return forced == "1"
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+    return (headers.get("save-data", "").lower() == "on"
+            or headers.get("ect", "").lower() in SLOW_CONNECTIONS)
+
+
+def probability_bars(probabilities, labels, colors=BAR_COLORS):
+    """Horizontal percentage bars as HTML, one per probability (0-1)"""
+    rows = []
+    for prob, label, color in zip(probabilities, labels, colors):
+        pct = 0.0 if prob is None or np.isnan(prob) else float(np.clip(prob * 100, 0, 100))
+        rows.append(
+            f"<div class='lite-bar'><span>{html.escape(label)}</span><b>{pct:.1f}%</b>"
+            f"<div class='lite-track'><div style='width:{pct:.1f}%;background:{color}'></div></div></div>"
+        )
+    return "<div class='lite-bars'>" + "".join(rows) + "</div>"
+
+
+def sparkline_svg(days, scores, levels, title=""):
+    """CVI score sparkline over a label-colour strip, as an inline SVG string
+
+    `days` are day numbers, `scores` CVI scores (0-100) and `levels` numeric
+    CVI levels (1-3, NaN when unlabelled), all for the same rows. Long
+    windows are reduced with `lod`, so the SVG size stays bounded.
+    """
+    days = np.asarray(days, dtype=np.float64)
+    scores = np.asarray(scores, dtype=np.float64)
+    w, h, strip = SPARKLINE_WIDTH, SPARKLINE_HEIGHT, STRIP_HEIGHT
+    plot_h = h - strip - 2
+    parts = [f"<svg class='lite-spark' viewBox='0 0 {w} {h}' width='100%' height='{h}' "
+             f"role='img' xmlns='http://www.w3.org/2000/svg'><title>{html.escape(title)}</title>"]
+    if len(days):
+        span = max(days[-1] - days[0] + 1, 1.0)
+
+        def x_of(d):
+            return (d - days[0]) / span * w
+
+        def y_of(score):
+            return plot_h - np.clip(score, 0, 100) / 100 * plot_h
+
+        for threshold in (33, 66):
+            y = y_of(threshold)
+            parts.append(f"<line x1='0' x2='{w}' y1='{y:.1f}' y2='{y:.1f}' stroke='#718096' "
+                         f"stroke-dasharray='3 3' stroke-width='0.5'/>")
+
+        starts, ends, run_levels = label_runs(levels, SPARKLINE_POINTS)
+        run_end = np.append(days[ends[:-1]], days[-1] + 1)
+        for start, end, level in zip(days[starts], run_end, run_levels):
+            if level in LEVEL_COLORS:
+                parts.append(f"<rect x='{x_of(start):.1f}' y='{h - strip}' width='{x_of(end) - x_of(start):.1f}' "
+                             f"height='{strip}' fill='{LEVEL_COLORS[level]}'/>")
+
+        scored = ~np.isnan(scores)
+        keep = lttb(days[scored], scores[scored], SPARKLINE_POINTS)
+        xs, ys = x_of(days[scored][keep]), y_of(scores[scored][keep])
+        if len(xs):
+            points = " ".join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys))
+            parts.append(f"<polyline points='{points}' fill='none' stroke='#667eea' stroke-width='1.5'/>")
+            parts.append(f"<circle cx='{xs[-1]:.1f}' cy='{ys[-1]:.1f}' r='2.5' fill='#764ba2'/>")
+    parts.append("</svg>")
+    return "".join(parts)
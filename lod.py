@@ -0,0 +1,67 @@
+"""Level-of-detail reduction for long history charts.
+
+A multi-year window has thousands of daily points, far more than a phone
+screen has pixels across. Above `MAX_CHART_POINTS` rows the history charts
+switch to reduced data:
+
+- `lttb` picks the CVI score points to draw (Largest-Triangle-Three-Buckets:
+  one point per bucket, the one that keeps the most visual area, so peaks
+  and dips survive),
+- `label_runs` collapses consecutive days with the same CVI level into one
+  segment, so every label transition is kept and nothing else. If even the
+  runs would exceed the budget, days are first bucketed to their highest
+  level, so High days are never dropped.
+"""
+import os
+
+import numpy as np
+
+MAX_CHART_POINTS = int(os.environ.get("CVI_MAX_CHART_POINTS", "400"))
+
+
+def lttb(x, y, threshold=MAX_CHART_POINTS):
+    """Positions of at most `threshold` points of (x, y) chosen by LTTB, first and last included"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # threshold - 2 buckets over the inner points, each holding at least one point
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def label_runs(levels, max_runs=None):
+    """(starts, ends, levels) of the runs of equal consecutive levels; ends are exclusive
+
+    `levels` are numeric CVI levels (NaN for unlabelled days, returned as 0).
+    With `max_runs`, too many runs are first reduced by taking the highest
+    level per bucket of days.
+    """
+    levels = np.nan_to_num(np.asarray(levels, dtype=np.float64), nan=0.0).astype(np.int64)
+    n = len(levels)
+    if not n:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+
+    def runs(values):
+        starts = np.flatnonzero(np.concatenate([[True], values[1:] != values[:-1]]))
+        return starts, np.append(starts[1:], n), values[starts]
+
+    starts, ends, run_levels = runs(levels)
+    if max_runs is not None and len(starts) > max_runs:
+        edges = np.unique(np.linspace(0, n, max_runs + 1).astype(np.int64)[:-1])
+        peaks = np.maximum.reduceat(levels, edges)
+        starts, ends, run_levels = runs(np.repeat(peaks, np.diff(np.append(edges, n))))
+    return starts, ends, run_levels
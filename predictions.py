@@ -0,0 +1,345 @@
+"""Loading of the predictions dataset through a typed columnar cache.
+
+The CSV is parsed once and written next to it as an Arrow/Feather file with
+the final dtypes (datetime64 dates, categorical labels, float32 metrics).
+Every later load only memory-maps that file. The decoded `multi_next`
+forecast table is cached the same way. Each cache records the source's
+mtime, size and SHA-256. When the source only grew (the daily model run
+appends a row), just the appended tail is parsed and added to the cache.
+Any other change rebuilds the cache.
+
+Cached numeric columns are handed to pandas as zero-copy views of the
+memory map. Several server processes reading the same cache therefore share
+its pages instead of each holding a private copy.
+"""
+import hashlib
+import io
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from forecasts import build_forecast_table
+
+CACHE_DIR = ".cache"
+CACHE_VERSION = "2"
+# Serve numeric columns straight from the memory-mapped cache files, so
+# every worker process shares one copy in the OS page cache
+SHARED_DATA = os.environ.get("CVI_SHARED_DATA", "1") != "0"
+
+CATEGORY_COLUMNS = ["cvi_label", "price_movement"]
+FLOAT_COLUMNS = [
+    "cvi_score", "prob_low", "prob_med", "prob_high",
+    "price_momentum_7", "price_momentum_3", "vol_7", "vol_30",
+    "Modal_Price", "modal_price", "market_price",
+]
+SCHEMA_DTYPES = {
+    **{col: "category" for col in CATEGORY_COLUMNS},
+    **{col: "float32" for col in FLOAT_COLUMNS},
+}
+# Only needed to build the forecast table, never kept in the predictions frame
+RAW_COLUMNS = ["multi_next"]
+FORECAST_SOURCE_COLUMNS = ["date", "multi_next"]
+
+
+def cache_path_for(file_path, name=None):
+    """Return the columnar cache path used for a source CSV"""
+    folder, base = os.path.split(os.path.abspath(file_path))
+    stem = os.path.splitext(base)[0]
+    if name:
+        stem = f"{stem}.{name}"
+    return os.path.join(folder, CACHE_DIR, f"{stem}.feather")
+
+
+def file_digest(file_path, chunk_size=1 << 20):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_version(paths):
+    """Short fingerprint of the size and mtime of the given source files"""
+    digest = hashlib.sha1()
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:12]
+
+
+def appended_tail(file_path, size, sha256):
+    """Rows appended to `file_path` after its first `size` bytes
+
+    Returns (rows, new_size, new_sha256), where rows only covers complete
+    lines, or None when the first `size` bytes no longer hash to `sha256`
+    (the file was rewritten rather than appended to).
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        header = f.readline()
+        f.seek(0)
+        remaining = size
+        while remaining > 0:
+            chunk = f.read(min(remaining, 1 << 20))
+            if not chunk:
+                return None
+            digest.update(chunk)
+            remaining -= len(chunk)
+        if digest.hexdigest() != sha256:
+            return None
+        if size:
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                return None
+        tail = f.read()
+
+    # A line still being written is left for the next call
+    tail = tail[:tail.rfind(b"\n") + 1]
+    digest.update(tail)
+    rows = parse_predictions_csv(io.BytesIO(header + tail), keep_raw=True)
+    return rows, size + len(tail), digest.hexdigest()
+
+
+def append_predictions(df, rows):
+    """Predictions frame `df` followed by newly parsed `rows`"""
+    rows = rows.drop(columns=RAW_COLUMNS, errors="ignore")
+    return apply_schema(pd.concat([df, rows], ignore_index=True))
+
+
+def append_forecasts(forecasts, rows):
+    """Forecast table extended with the decoded forecasts of newly parsed `rows`"""
+    table = pd.concat([forecasts, build_forecast_table(rows)], ignore_index=True)
+    table["label"] = table["label"].astype("category")
+    return table.sort_values(["source_date", "target_date"], kind="stable").reset_index(drop=True)
+
+
+def parse_predictions_csv(file_path, keep_raw=False):
+    """Parse the predictions CSV straight into its compact dtypes
+
+    Labels are read as categoricals and metrics as float32, so no wide
+    intermediate frame is built. The raw `multi_next` text is skipped
+    unless `keep_raw` is set; it is decoded into the forecast table instead.
+    """
+    usecols = None if keep_raw else (lambda column: column not in RAW_COLUMNS)
+    return pd.read_csv(file_path, dtype=SCHEMA_DTYPES, parse_dates=['date'], usecols=usecols)
+
+
+def parse_forecast_source(file_path):
+    """Only the columns the forecast table is decoded from"""
+    return pd.read_csv(file_path, parse_dates=['date'],
+                       usecols=lambda column: column in FORECAST_SOURCE_COLUMNS)
+
+
+def memory_report(df):
+    """Bytes held by each column, largest first (string data counted deeply)"""
+    return pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "bytes": df.memory_usage(index=False, deep=True),
+    }).sort_values("bytes", ascending=False)
+
+
+def apply_schema(df):
+    """Cast known columns to their compact dtypes"""
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    for col in FLOAT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("float32")
+    return df
+
+
+def _read_cache_metadata(cache_path):
+    """Return the source fingerprint stored in a cache file, or None"""
+    try:
+        with pa.memory_map(cache_path, "r") as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    return {k.decode(): v.decode() for k, v in metadata.items()
+            if not k.startswith(b"pandas")}
+
+
+def write_cache(df, cache_path, fingerprint):
+    """Atomically write a DataFrame and its source fingerprint to the cache"""
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        # Keep NaN as a float value rather than a null: a column without a
+        # validity bitmap can be memory-mapped into pandas without a copy
+        if pa.types.is_floating(field.type) and table.column(i).null_count:
+            values = pa.array(df[field.name].to_numpy(dtype=field.type.to_pandas_dtype()), from_pandas=False)
+            table = table.set_column(i, field, values)
+    metadata = dict(table.schema.metadata or {})
+    metadata.update({k.encode(): str(v).encode() for k, v in fingerprint.items()})
+    table = table.replace_schema_metadata(metadata)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    # Uncompressed so readers can memory-map the columns directly
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, cache_path)
+
+
+def read_cache(cache_path):
+    """Read a cache file back into a DataFrame
+
+    With SHARED_DATA the blocks are not consolidated, so numeric columns stay
+    views of the memory-mapped file.
+    """
+    return feather.read_table(cache_path, memory_map=True).to_pandas(split_blocks=SHARED_DATA)
+
+
+def _read_cache_table(cache_path):
+    """(memory-mapped table, source fingerprint) of a cache file, or (None, None)
+
+    Rows and fingerprint come from the same open file, so they agree even if
+    another process replaces the cache in between.
+    """
+    try:
+        table = feather.read_table(cache_path, memory_map=True)
+    except (OSError, pa.ArrowInvalid):
+        return None, None
+    metadata = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()
+                if not k.startswith(b"pandas")}
+    return table, metadata
+
+
+def _to_frame(table):
+    return table.to_pandas(split_blocks=SHARED_DATA)
+
+
+def _read_source(file_path):
+    """(bytes, (size, sha256)) of a source file, read once"""
+    with open(file_path, "rb") as f:
+        data = f.read()
+    return data, (len(data), hashlib.sha256(data).hexdigest())
+
+
+def publish(df, cache_path, fingerprint):
+    """Write `df` to the cache and return it read back from the shared mapping
+
+    Returns `df` itself when sharing is off, the cache cannot be written, or
+    another process has already replaced it with a different version.
+    """
+    try:
+        write_cache(df, cache_path, fingerprint)
+    except OSError:
+        # Read-only deployments still work, just without the cache
+        return df
+    if not SHARED_DATA:
+        return df
+    table, cached = _read_cache_table(cache_path)
+    if cached is None or any(cached.get(k) != str(v) for k, v in fingerprint.items()):
+        return df
+    return _to_frame(table)
+
+
+def load_published(cache_path, version, build):
+    """Frame cached under a source `version`, built and published by the first process to need it
+
+    `build()` returns (frame, sources), where `sources` maps each source file
+    to the (size, sha256) the frame was built from. Returns the same pair.
+    """
+    table, cached = _read_cache_table(cache_path)
+    if cached is not None and cached.get("cache_version") == CACHE_VERSION \
+            and cached.get("source_version") == version and "sources" in cached:
+        sources = {path: tuple(state) for path, state in json.loads(cached["sources"]).items()}
+        return _to_frame(table), sources
+    df, sources = build()
+    fingerprint = {"cache_version": CACHE_VERSION, "source_version": version, "sources": json.dumps(sources)}
+    return publish(df, cache_path, fingerprint), sources
+
+
+def load_cached(file_path, build, name=None, extend=None):
+    """Return `build(file_path)` through a cache file, rebuilding it if the source changed
+
+    With `extend(cached, rows)`, a source that was only appended to is
+    brought up to date by parsing just the new rows. Returns (frame, source),
+    where `source` is the (size, sha256) of the source bytes the frame holds.
+    """
+    stat = os.stat(file_path)
+    cache_path = cache_path_for(file_path, name)
+    fingerprint = {
+        "cache_version": CACHE_VERSION,
+        "source_mtime_ns": str(stat.st_mtime_ns),
+        "source_size": str(stat.st_size),
+    }
+
+    table, cached = _read_cache_table(cache_path)
+    if cached is not None and cached.get("cache_version") == CACHE_VERSION and "source_sha256" in cached:
+        if all(cached.get(k) == v for k, v in fingerprint.items()):
+            return _to_frame(table), (stat.st_size, cached["source_sha256"])
+
+        # mtime moved (copy, touch, checkout) - only rebuild if the bytes did
+        fingerprint["source_sha256"] = file_digest(file_path)
+        if cached.get("source_sha256") == fingerprint["source_sha256"]:
+            df = _to_frame(table)
+            try:
+                write_cache(df, cache_path, fingerprint)
+            except OSError:
+                # Read-only deployments keep serving the still-valid cache
+                pass
+            return df, (int(cached["source_size"]), cached["source_sha256"])
+
+        tail = None
+        if extend is not None and cached.get("source_size", "").isdigit():
+            tail = appended_tail(file_path, int(cached["source_size"]), cached["source_sha256"])
+        if tail is not None:
+            rows, size, sha256 = tail
+            fingerprint.update(source_size=str(size), source_sha256=sha256)
+            return publish(extend(_to_frame(table), rows), cache_path, fingerprint), (size, sha256)
+
+    # Parse the same bytes that are hashed; a later append is picked up as a tail
+    data, source = _read_source(file_path)
+    fingerprint.update(source_size=str(source[0]), source_sha256=source[1])
+    return publish(build(io.BytesIO(data)), cache_path, fingerprint), source
+
+
+def _uncached(file_path, build):
+    data, source = _read_source(file_path)
+    return build(io.BytesIO(data)), source
+
+
+def read_predictions(file_path='2025_predictions.csv', use_cache=True, with_source=False):
+    """Load predictions, rebuilding the columnar cache if the source changed
+
+    With `with_source`, returns (frame, (size, sha256) of the source bytes it holds).
+    """
+    if use_cache:
+        df, source = load_cached(file_path, parse_predictions_csv, extend=append_predictions)
+    elif with_source:
+        df, source = _uncached(file_path, parse_predictions_csv)
+    else:
+        return parse_predictions_csv(file_path)
+    return (df, source) if with_source else df
+
+
+def _forecast_table(source):
+    return build_forecast_table(parse_forecast_source(source))
+
+
+def read_forecasts(file_path='2025_predictions.csv', use_cache=True, with_source=False):
+    """Load the decoded `multi_next` forecast table for a predictions file
+
+    With `with_source`, returns (table, (size, sha256) of the source bytes it holds).
+    """
+    if use_cache:
+        forecasts, source = load_cached(file_path, _forecast_table, name="forecasts", extend=append_forecasts)
+    elif with_source:
+        forecasts, source = _uncached(file_path, _forecast_table)
+    else:
+        return _forecast_table(file_path)
+    return (forecasts, source) if with_source else forecasts
+
+
+if __name__ == "__main__":
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else '2025_predictions.csv'
+    for title, frame in [("predictions", read_predictions(path)), ("forecasts", read_forecasts(path))]:
+        report = memory_report(frame)
+        print(f"{title}: {len(frame)} rows, {report['bytes'].sum() / 1024:.1f} KiB")
+        print(report.to_string(), end="\n\n")
@@ -0,0 +1,168 @@
+"""Opt-in render timing for the dashboard.
+
+Turn it on with `CVI_PROFILE=1`, or per page with `?profile=1` in the URL.
+A run splits the script into named sections with `lap()` calls, and
+functions wrapped in `@timed` are timed whenever a run is active in the
+current script thread. When a run finishes, its timings are
+
+- kept in a process-wide registry that holds the recent durations of each
+  section across all sessions (for p50/p95),
+- logged as one JSON line on the `cvi.timing` logger,
+- written as a Prometheus text-format summary to `CVI_METRICS_FILE`, if
+  set (`{pid}` in the path gives each worker process its own file).
+
+With profiling off, `lap()` is a no-op and `@timed` costs one context
+variable lookup.
+"""
+import contextvars
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+
+ENABLED = os.environ.get("CVI_PROFILE", "0") == "1"
+METRICS_FILE = os.environ.get("CVI_METRICS_FILE")
+HISTORY_SIZE = 1024
+QUANTILES = (0.5, 0.95)
+
+logger = logging.getLogger("cvi.timing")
+if not logger.handlers:
+    _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_active = contextvars.ContextVar("cvi_profile_run", default=None)
+_durations = defaultdict(lambda: deque(maxlen=HISTORY_SIZE))
+_totals = defaultdict(lambda: [0, 0.0])
+_lock = threading.Lock()
+
+
+class Run:
+    """Section timings of one script run"""
+
+    def __init__(self, name):
+        self.name = name
+        self.timings = []
+        self.started = self._last = time.perf_counter()
+        _active.set(self)
+
+    def lap(self, section):
+        """Close the section that ends here"""
+        now = time.perf_counter()
+        self.timings.append((section, now - self._last))
+        self._last = now
+
+    def add(self, name, seconds):
+        self.timings.append((name, seconds))
+
+    def finish(self):
+        """Record the run's timings and return them as (name, seconds) pairs"""
+        _active.set(None)
+        timings = self.timings + [(f"{self.name}_total", time.perf_counter() - self.started)]
+        with _lock:
+            for name, seconds in timings:
+                _durations[name].append(seconds)
+                _totals[name][0] += 1
+                _totals[name][1] += seconds
+        logger.info(json.dumps({
+            "event": "render_timing",
+            "run": self.name,
+            "ms": {name: round(seconds * 1000, 3) for name, seconds in timings},
+        }))
+        if METRICS_FILE:
+            write_metrics(METRICS_FILE.format(pid=os.getpid()))
+        return timings
+
+
+class _NullRun:
+    timings = []
+
+    def lap(self, section):
+        pass
+
+    def add(self, name, seconds):
+        pass
+
+    def finish(self):
+        return []
+
+
+NULL_RUN = _NullRun()
+
+
+def start_run(name="page", enabled=ENABLED):
+    """Start timing a script run, or return a no-op run when profiling is off
+
+    Always replaces the thread's active run: a previous run that ended in
+    `st.rerun()`, `st.stop()` or an exception never reached `finish()`.
+    """
+    if not enabled:
+        _active.set(None)
+        return NULL_RUN
+    return Run(name)
+
+
+def active_run():
+    return _active.get()
+
+
+def timed(fn):
+    """Time `fn` into the active run, if there is one"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        run = _active.get()
+        if run is None:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            run.add(f"{fn.__name__}()", time.perf_counter() - start)
+    return wrapper
+
+
+def summary():
+    """(name, count, p50 seconds, p95 seconds) per recorded section, across sessions"""
+    with _lock:
+        snapshot = {name: np.array(values) for name, values in _durations.items()}
+        counts = {name: total[0] for name, total in _totals.items()}
+    return [
+        (name, counts[name], *np.quantile(values, QUANTILES))
+        for name, values in sorted(snapshot.items())
+    ]
+
+
+def prometheus_text():
+    """All recorded sections as a Prometheus text-format summary"""
+    lines = [
+        "# HELP cvi_render_section_seconds Dashboard render time per section.",
+        "# TYPE cvi_render_section_seconds summary",
+    ]
+    with _lock:
+        snapshot = {name: (np.array(values), list(_totals[name])) for name, values in _durations.items()}
+    for name, (values, (count, total)) in sorted(snapshot.items()):
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        for q, value in zip(QUANTILES, np.quantile(values, QUANTILES)):
+            lines.append(f'cvi_render_section_seconds{{section="{label}",quantile="{q}"}} {value:.6f}')
+        lines.append(f'cvi_render_section_seconds_sum{{section="{label}"}} {total:.6f}')
+        lines.append(f'cvi_render_section_seconds_count{{section="{label}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path):
+    """Atomically write the Prometheus summary, e.g. for a node_exporter textfile collector"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(prometheus_text())
+        os.replace(tmp_path, path)
+    except OSError:
+        logger.warning("Could not write metrics to %s", path)
@@ -0,0 +1,201 @@
+"""Date-indexed access to the predictions frame.
+
+`PredictionStore` sorts the predictions by date once and keeps an
+ordinal-day -> row-position array next to it. A point lookup is then a
+single array read, and a history window is two binary searches on the
+sorted day numbers followed by a slice. Neither gets slower as the history
+grows. A store is never changed once built: rows appended after the last
+date produce a new store (`extended`) that shares the old day index, so a
+reader holding either one always sees a consistent snapshot.
+
+Cumulative sums of the CVI score and cumulative counts of each CVI label
+are built alongside, so `window_stats` (mean CVI and label distribution)
+costs the same for a week as for ten years.
+
+Data without the precomputed momentum/volatility columns gets them derived
+from its price column (see `features`), and any other windows are computed
+on request.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from features import fill_price_features, momentum_column, price_column, price_feature, volatility_column
+from forecasts import forecasts_for
+from predictions import append_forecasts, append_predictions
+
+
+# Label distribution classes; 'Medium' counts as 'Med'
+LABEL_CLASSES = ('Low', 'Med', 'High')
+LABEL_CLASS_INDEX = {'Low': 0, 'Med': 1, 'Medium': 1, 'High': 2}
+# Computed momentum/volatility columns kept per store, shared by all sessions
+FEATURE_CACHE_SIZE = int(os.environ.get("CVI_FEATURE_CACHE_SIZE", "32"))
+
+
+def cumulative_aggregates(frame):
+    """Prefix sums of CVI score, scored rows and label counts; [i] covers rows before i"""
+    score = frame['cvi_score'].to_numpy(dtype=np.float64)
+    scored = ~np.isnan(score)
+    classes = frame['cvi_label'].astype(object).map(LABEL_CLASS_INDEX).to_numpy()
+    one_hot = (classes[:, None] == np.arange(len(LABEL_CLASSES))).astype(np.int64)
+    return (
+        np.concatenate([[0.0], np.cumsum(np.where(scored, score, 0.0))]),
+        np.concatenate([[0], np.cumsum(scored)]),
+        np.concatenate([np.zeros((1, len(LABEL_CLASSES)), dtype=np.int64), np.cumsum(one_hot, axis=0)]),
+    )
+
+
+def to_day(date):
+    """Days since the epoch for a date-like value"""
+    return int(np.datetime64(pd.Timestamp(date), 'D').astype(np.int64))
+
+
+class PredictionStore:
+    """Predictions (and their decoded forecasts) indexed by day"""
+
+    def __init__(self, df, forecasts=None, version="0", sources=None):
+        self.version = version
+        # Source path -> (size, sha256) of the bytes loaded, for append detection
+        self.sources = sources
+        self.frame = df.sort_values('date', kind='stable').reset_index(drop=True)
+        self.forecasts = forecasts
+        self.days = self.frame['date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        # Feature columns derived here rather than read from the data
+        self.derived = fill_price_features(self.frame)
+        self._features = OrderedDict()
+        self._features_lock = threading.Lock()
+        self.score_sums, self.score_counts, self.label_counts = cumulative_aggregates(self.frame)
+
+        if len(self.days):
+            self.first_day = int(self.days[0])
+            self.last_day = int(self.days[-1])
+            self.positions = np.full(self.last_day - self.first_day + 1, -1, dtype=np.int64)
+            # Assign in reverse so the first row wins when a date repeats
+            order = np.arange(len(self.days))[::-1]
+            self.positions[self.days[order] - self.first_day] = order
+        else:
+            self.first_day = self.last_day = 0
+            self.positions = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def min_date(self):
+        return self.frame['date'].iloc[0].date()
+
+    @property
+    def max_date(self):
+        return self.frame['date'].iloc[-1].date()
+
+    def position(self, date):
+        """Row position for `date`, or -1 if there is no prediction that day"""
+        offset = to_day(date) - self.first_day
+        if offset < 0 or offset >= len(self.positions):
+            return -1
+        return int(self.positions[offset])
+
+    def row(self, date):
+        """Prediction row for `date` as a Series, or None"""
+        pos = self.position(date)
+        if pos < 0:
+            return None
+        return self.frame.iloc[pos]
+
+    def bounds(self, end_date, days_back):
+        """(lo, hi) row positions of the window ending at `end_date`"""
+        end = to_day(end_date)
+        lo = int(np.searchsorted(self.days, end - days_back, side='left'))
+        hi = int(np.searchsorted(self.days, end, side='right'))
+        return lo, hi
+
+    def window(self, end_date, days_back):
+        """Rows dated within `days_back` days up to and including `end_date`"""
+        lo, hi = self.bounds(end_date, days_back)
+        return self.frame.iloc[lo:hi]
+
+    def window_stats(self, end_date, days_back):
+        """Row count, mean CVI score and label counts for a window, from the prefix sums"""
+        lo, hi = self.bounds(end_date, days_back)
+        scored = int(self.score_counts[hi] - self.score_counts[lo])
+        counts = self.label_counts[hi] - self.label_counts[lo]
+        return {
+            'days': hi - lo,
+            'mean_cvi': float(self.score_sums[hi] - self.score_sums[lo]) / scored if scored else None,
+            **{f'{label.lower()}_days': int(n) for label, n in zip(LABEL_CLASSES, counts)},
+        }
+
+    def _feature(self, kind, window):
+        """One computed feature column, through a small LRU of columns"""
+        key = (kind, int(window))
+        with self._features_lock:
+            if key in self._features:
+                self._features.move_to_end(key)
+                return self._features[key]
+        values = price_feature(self.frame, kind, window)
+        with self._features_lock:
+            self._features[key] = values
+            while len(self._features) > FEATURE_CACHE_SIZE:
+                self._features.popitem(last=False)
+        return values
+
+    def features(self, momentum_windows, volatility_windows):
+        """Momentum and volatility columns for these windows, or None without prices"""
+        if price_column(self.frame) is None:
+            return None
+        columns = {momentum_column(w): self._feature("momentum", w) for w in momentum_windows}
+        columns.update({volatility_column(w): self._feature("volatility", w) for w in volatility_windows})
+        return pd.DataFrame(columns, index=self.frame.index)
+
+    def forecasts_for(self, date):
+        """Decoded forecast rows issued on `date`"""
+        if self.forecasts is None:
+            return None
+        return forecasts_for(self.forecasts, date)
+
+    def extended(self, rows, version, sources):
+        """New store with rows dated after the last row appended, or None
+
+        Returns None when the rows would not go strictly after the current
+        history; the caller should reload. `self` is left untouched.
+        """
+        store = object.__new__(PredictionStore)
+        store.__dict__.update(self.__dict__)
+        store.version = version
+        store.sources = sources
+        store._features = OrderedDict()
+        store._features_lock = threading.Lock()
+        if not len(rows):
+            return store
+
+        rows = rows.sort_values('date', kind='stable').reset_index(drop=True)
+        days = rows['date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        if not len(self.days) or days[0] <= self.last_day:
+            return None
+
+        frame = append_predictions(self.frame, rows)
+        if self.derived:
+            # Rolling windows reach back into the old rows, so derive over the whole series
+            frame = frame.drop(columns=self.derived)
+            fill_price_features(frame)
+        store.frame = frame
+        store.forecasts = append_forecasts(self.forecasts, rows) if self.forecasts is not None else None
+
+        # Prefix sums continue from the old totals
+        tail = cumulative_aggregates(frame.iloc[len(self.frame):])
+        store.score_sums, store.score_counts, store.label_counts = (
+            np.concatenate([old, new[1:] + old[-1]])
+            for old, new in zip((self.score_sums, self.score_counts, self.label_counts), tail)
+        )
+
+        store.last_day = int(days[-1])
+        store.positions = np.concatenate([
+            self.positions, np.full(store.last_day - self.last_day, -1, dtype=np.int64),
+        ])
+        order = np.arange(len(days))[::-1]
+        store.positions[days[order] - self.first_day] = order + len(self.days)
+        store.days = np.concatenate([self.days, days])
+        return store
@@ -0,0 +1,230 @@
+"""UI strings for every supported language."""
+
+translations = {
+    "English": {
+        "title": "Farmer's Commodity Volatility Index",
+        "select_date": "📅 Select Date",
+        "choose_date": "Choose prediction date",
+        "timeline": "Timeline (days)",
+        "market_analysis": "Market Analysis for",
+        "key_signals": "Key Market Signals",
+        "market_volatility": "Market Volatility",
+        "cvi_score": "CVI Score",
+        "price_direction": "Price Direction",
+        "momentum_7day": "7-Day Momentum",
+        "market_price": "Market Price",
+        "modal_price": "Modal Price (Most Common)",
+        "momentum_analysis": "Price Momentum & Volatility Analysis",
+        "key_indicators": "Key Indicators",
+        "price_momentum_7": "7-Day Price Momentum",
+        "price_momentum_3": "3-Day Price Momentum",
+        "volatility_7": "7-Day Volatility",
+        "volatility_30": "30-Day Volatility",
+        "price_momentum_n": "{n}-Day Price Momentum",
+        "volatility_n": "{n}-Day Volatility",
+        "indicator_windows": "Indicator Windows (days)",
+        "momentum_interpretation": "Momentum Interpretation",
+        "volatility_probability": "Volatility Probability Distribution",
+        "low_volatility": "Low Volatility",
+        "med_volatility": "Med Volatility",
+        "high_volatility": "High Volatility",
+        "historical_trends": "Historical Market Trends",
+        "price_trend_analysis": "Price Trend Analysis",
+        "risk_summary": "Risk Level Summary",
+        "volatility_risk": "Volatility Risk",
+        "price_trend": "Price Trend",
+        "market_health": "Market Health",
+        "excellent": "Excellent",
+        "fair": "Fair",
+        "poor": "Poor",
+        "up": "Up",
+        "down": "Down",
+        "stable": "Stable",
+        "low": "Low",
+        "med": "Med",
+        "medium": "Medium",
+        "high": "High",
+        "unknown": "Unknown",
+        "dataset_info": "📊 Dataset Info",
+        "total_predictions": "Total Predictions",
+        "date_range": "Date Range",
+        "days": "days",
+        "cvi_distribution": "📈 CVI Distribution",
+        "high_cvi_days": "High CVI Days",
+        "med_cvi_days": "Med CVI Days",
+        "low_cvi_days": "Low CVI Days",
+        "mean_cvi": "Mean CVI",
+        "lite_mode": "Lite mode (slow connection)",
+        "about_cvi": "About CVI",
+        "multi_forecast": "Multi-Step Forecast",
+        "forecast_next_days": "Forecast for Next Days",
+        "forecasted_date": "Forecasted Date",
+        "predicted_volatility": "Predicted Volatility",
+        "confidence": "Confidence",
+        "view_details": "View Details",
+        "decision_matrix": "Decision Guide",
+        "situation": "Situation",
+        "farmer_action": "Recommended Action",
+        "calendar_risk": "Calendar Risk",
+        "alert_risk": "Alert Risk (3-7 days)",
+        "both_low": "Both LOW",
+        "seasonal_low_alert_high": "Seasonal LOW + Alert HIGH",
+        "seasonal_high_alert_low": "Seasonal HIGH + Alert LOW",
+        "both_high": "Both HIGH",
+        "sell_normally": "✓ Sell normally - Good conditions",
+        "be_cautious": "⚠ Be cautious, maybe wait - Short-term volatility expected",
+        "seasonal_risk_stable": "ℹ Seasonal risk exists, but market stable short-term",
+        "strong_warning": "⚠ Strong warning - Stagger sales or wait",
+        "calendar_risk": "Calendar Risk",
+        "alert_risk": "Alert Risk (3-7 days)",
+        "calendar_risk_desc":"Shows how risky this date usually is based on season, festivals, and past market patterns.",
+        "alert_risk_desc":"Short-term volatility risk based on recent market trends and predictions.",
+        "about_text": """**Commodity Volatility Index**,
+        
+            
+Measures market instability:
+- Low: Stable market
+- Medium: Moderate swings
+- High: Unstable prices
+
+Combined with price direction for better decisions.""",
+        "strong_upward": "Strong Upward Momentum Detected",
+        "strong_downward": "Strong Downward Momentum Detected",
+        "stable_movement": "Stable Price Movement",
+        "signal": "Signal",
+        "prices_rising": "Prices are rising consistently - Good time to sell if you need to",
+        "prices_falling": "Prices are falling - Hold if possible, avoid distress sales",
+        "no_strong_trend": "No strong directional trend - Standard market conditions",
+        "volatility": "Volatility",
+        "dataset": "Dataset",
+        "commodity": "Commodity",
+        "market": "Market (APMC)",
+    },
+    "मराठी (Marathi)": {
+        "title": "शेतकऱ्यांचा कमोडिटी व्होलॅटिलिटी इंडेक्स",
+        "select_date": "📅 तारीख निवडा",
+        "choose_date": "अंदाज तारीख निवडा",
+        "timeline": "टाइमलाइन (दिवस)",
+        "market_analysis": "बाजार विश्लेषण",
+        "key_signals": "मुख्य बाजार संकेत",
+        "market_volatility": "बाजार अस्थिरता",
+        "cvi_score": "सीव्हीआय स्कोअर",
+        "price_direction": "किंमत दिशा",
+        "momentum_7day": "७-दिवस गती",
+        "market_price": "बाजार किंमत",
+        "modal_price": "मोडल किंमत (सर्वसाधारण)",
+        "momentum_analysis": "किंमत गती आणि अस्थिरता विश्लेषण",
+        "key_indicators": "मुख्य सूचक",
+        "price_momentum_7": "७-दिवस किंमत गती",
+        "price_momentum_3": "३-दिवस किंमत गती",
+        "volatility_7": "७-दिवस अस्थिरता",
+        "volatility_30": "३०-दिवस अस्थिरता",
+        "price_momentum_n": "{n}-दिवस किंमत गती",
+        "volatility_n": "{n}-दिवस अस्थिरता",
+        "indicator_windows": "निर्देशक कालावधी (दिवस)",
+        "momentum_interpretation": "गती स्पष्टीकरण",
+        "volatility_probability": "अस्थिरता संभाव्यता वितरण",
+        "low_volatility": "कमी अस्थिरता",
+        "med_volatility": "मध्यम अस्थिरता",
+        "high_volatility": "उच्च अस्थिरता",
+        "historical_trends": "ऐतिहासिक बाजार ट्रेंड",
+        "price_trend_analysis": "किंमत ट्रेंड विश्लेषण",
+        "risk_summary": "जोखीम पातळी सारांश",
+        "volatility_risk": "अस्थिरता जोखीम",
+        "price_trend": "किंमत ट्रेंड",
+        "market_health": "बाजार आरोग्य",
+        "excellent": "उत्तम",
+        "fair": "चांगले",
+        "poor": "खराब",
+        "up": "वर",
+        "down": "खाली",
+        "stable": "स्थिर",
+        "low": "कमी",
+        "med": "मध्यम",
+        "medium": "मध्यम",
+        "high": "उच्च",
+        "unknown": "अज्ञात",
+        "dataset_info": "📊 डेटासेट माहिती",
+        "total_predictions": "एकूण अंदाज",
+        "date_range": "तारीख श्रेणी",
+        "days": "दिवस",
+        "cvi_distribution": "📈 सीव्हीआय वितरण",
+        "high_cvi_days": "उच्च सीव्हीआय दिवस",
+        "med_cvi_days": "मध्यम सीव्हीआय दिवस",
+        "low_cvi_days": "कमी सीव्हीआय दिवस",
+        "mean_cvi": "सरासरी सीव्हीआय",
+        "lite_mode": "हलका मोड (मंद कनेक्शन)",
+        "about_cvi": "सीव्हीआय बद्दल",
+        "multi_forecast": "बहु-चरण अंदाज",
+        "forecast_next_days": "पुढील दिवसांसाठी अंदाज",
+        "forecasted_date": "अंदाजित तारीख",
+        "predicted_volatility": "अंदाजित अस्थिरता",
+        "confidence": "आत्मविश्वास",
+        "view_details": "तपशील पहा",
+        "decision_matrix": "निर्णय मार्गदर्शक",
+        "situation": "परिस्थिती",
+        "farmer_action": "शिफारस केलेली कृती",
+        "calendar_risk": "हंगामी जोखीम",
+        "alert_risk": "सतर्कता जोखीम (३-७ दिवस)",
+        "both_low": "दोन्ही कमी",
+        "seasonal_low_alert_high": "हंगामी कमी + सतर्कता उच्च",
+        "seasonal_high_alert_low": "हंगामी उच्च + सतर्कता कमी",
+        "both_high": "दोन्ही उच्च",
+        "sell_normally": "✓ सामान्यपणे विका - चांगल्या परिस्थिती",
+        "be_cautious": "⚠ सावध रहा, कदाचित प्रतीक्षा करा - अल्पकालीन अस्थिरता अपेक्षित",
+        "seasonal_risk_stable": "ℹ हंगामी जोखीम अस्तित्वात आहे, परंतु बाजार अल्पकालीन स्थिर",
+        "strong_warning": "⚠ मजबूत चेतावणी - विक्री टप्प्याटप्प्याने करा किंवा प्रतीक्षा करा",
+        "calendar_risk": "कॅलेंडर जोखीम",
+        "alert_risk": "सतर्कता जोखीम (३-७ दिवस)",
+        "calendar_risk_desc":"हंगाम, सण आणि मागील बाजार पद्धतींवर आधारित ही तारीख सहसा किती धोकादायक असते हे दर्शविते.",
+        "alert_risk_desc":"अलिकडच्या किमतीतील चढउतार आणि अपेक्षित परिस्थितींवर आधारित अल्पकालीन बाजार अनिश्चितता दर्शवते.",
+        "about_text": """**कमोडिटी व्होलॅटिलिटी इंडेक्स**
+            
+बाजार अस्थिरता मोजते:
+- कमी: स्थिर बाजार
+- मध्यम: मध्यम बदल
+- उच्च: अस्थिर किंमती
+
+चांगल्या निर्णयांसाठी किंमत दिशेसह एकत्रित.""",
+        "strong_upward": "मजबूत वरच्या दिशेने गती आढळली",
+        "strong_downward": "मजबूत खालच्या दिशेने गती आढळली",
+        "stable_movement": "स्थिर किंमत हालचाल",
+        "signal": "संकेत",
+        "prices_rising": "किंमती सातत्याने वाढत आहेत - आवश्यक असल्यास विकण्यासाठी चांगली वेळ",
+        "prices_falling": "किंमती घसरत आहेत - शक्य असल्यास धरून ठेवा, घाईची विक्री टाळा",
+        "no_strong_trend": "कोणताही मजबूत दिशात्मक कल नाही - मानक बाजार परिस्थिती",
+        "volatility": "अस्थिरता",
+        "dataset": "डेटासेट",
+        "commodity": "शेतमाल",
+        "market": "बाजार समिती (APMC)",
+    }
+}
+
+
+# Short codes accepted by the API and CLI
+LANGUAGE_CODES = {
+    "en": "English",
+    "mr": "मराठी (Marathi)",
+}
+
+
+def resolve_language(name_or_code):
+    """Language name for a code or name, or None if unsupported"""
+    if name_or_code in translations:
+        return name_or_code
+    return LANGUAGE_CODES.get(str(name_or_code).strip().lower())
+
+
+def missing_translations(catalogue=translations, reference="English"):
+    """Keys present in the reference language but absent from another one"""
+    expected = set(catalogue[reference])
+    return {
+        language: sorted(expected - set(strings))
+        for language, strings in catalogue.items()
+        if expected - set(strings)
+    }
+
+
+_missing = missing_translations()
+if _missing:
+    raise ValueError(f"Incomplete translations: {_missing}")
@@ -0,0 +1,250 @@
+"""Per-date render model, computed once per loaded dataset.
+
+Everything the dashboard derives from a prediction row - price direction,
+advisory, badge classes, health score, momentum branch, alert risk, the
+decision-matrix cell and which forecast cards apply - is computed here at
+load time. Rows are kept as small code arrays plus per-language tables over
+the distinct values, so memory stays at about two bytes per field and
+date. Serving a date is then a few array reads plus string formatting.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from advisory import (DECISION_CELLS, alert_risk_levels, classify_situations, get_advisory, price_movements,
+                      volatility_levels)
+from catalog import PARTITION_CACHE_SIZE
+from forecasts import MIN_CARD_HORIZON, latest_forecast_run
+from translations import translations
+
+# One view model per partition the catalogue keeps loaded
+VIEW_MODEL_CACHE_SIZE = PARTITION_CACHE_SIZE
+
+LABEL_COLORS = {'Low': '#10b981', 'Med': '#f59e0b', 'Medium': '#f59e0b', 'High': '#ef4444'}
+MOVEMENT_COLORS = {'Up': '#10b981', 'Down': '#ef4444', 'Stable': '#6366f1'}
+VOLATILITY_NUMERIC = {'Low': 1, 'Med': 2, 'Medium': 2, 'High': 3}
+HEALTH_COLORS = {'excellent': "#10b981", 'fair': "#f59e0b", 'poor': "#ef4444"}
+LABEL_PROBA_COLUMN = {'Low': 'proba_low', 'Med': 'proba_med', 'Medium': 'proba_med'}
+
+# Styling and copy for each momentum-interpretation branch
+MOMENTUM_STYLES = {
+    'up': {
+        'rgb': '16, 185, 129', 'accent': '#10b981', 'text_color': '#d1fae5', 'icon': '✓',
+        'title_key': 'strong_upward', 'signal_key': 'prices_rising',
+        'threshold_7': ' (threshold: >3%)', 'threshold_3': ' (threshold: >2%)',
+    },
+    'down': {
+        'rgb': '239, 68, 68', 'accent': '#ef4444', 'text_color': '#fecaca', 'icon': '⚠',
+        'title_key': 'strong_downward', 'signal_key': 'prices_falling',
+        'threshold_7': ' (threshold: <-3%)', 'threshold_3': ' (threshold: <-2%)',
+    },
+    'stable': {
+        'rgb': '59, 130, 246', 'accent': '#3b82f6', 'text_color': '#dbeafe', 'icon': 'ℹ',
+        'title_key': 'stable_movement', 'signal_key': 'no_strong_trend',
+        'threshold_7': '', 'threshold_3': '',
+    },
+}
+
+
+def momentum_signal(m7, m3):
+    """'up', 'down' or 'stable' momentum branch for arrays of 7/3-day momentum"""
+    m7 = np.asarray(m7, dtype=float)
+    m3 = np.asarray(m3, dtype=float)
+    return np.select([(m7 > 3) & (m3 > 2), (m7 < -3) & (m3 < -2)], ['up', 'down'], 'stable')
+
+
+def health_key(labels):
+    """Market-health translation key for an array of CVI labels"""
+    numeric = pd.Series(labels, dtype=object).map(VOLATILITY_NUMERIC).fillna(2).to_numpy(dtype=float)
+    score = (3 - numeric) * 33.33
+    return np.select([score > 66, score > 33], ['excellent', 'fair'], 'poor')
+
+
+def _forecast_view(forecasts):
+    """Forecast table with the confidence (probability of its label) and label color"""
+    labels = forecasts['label'].astype(object)
+    proba = forecasts['proba_high'].to_numpy(dtype=float)
+    for label, column in LABEL_PROBA_COLUMN.items():
+        proba = np.where(labels == label, forecasts[column].to_numpy(dtype=float), proba)
+    return forecasts.assign(
+        confidence=proba * 100,
+        color=labels.map(LABEL_COLORS).fillna('#6366f1').to_numpy(),
+    )
+
+
+def _encode(values):
+    """(int16 codes, distinct values) for an array; missing values get a code too"""
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=False)
+    return codes.astype(np.int16), np.asarray(uniques, dtype=object)
+
+
+def _volatility_info(v):
+    return {
+        'volatility': v,
+        'volatility_key': str(v).lower(),
+        'volatility_class': f"{str(v).lower()}-volatility",
+        'risk_color': LABEL_COLORS.get(v, '#6366f1'),
+    }
+
+
+def _movement_info(m):
+    return {
+        'price_movement': m,
+        'price_key': m.lower(),
+        'price_class': f"price-{m.lower()}",
+        'movement_color': MOVEMENT_COLORS.get(m, '#6366f1'),
+    }
+
+
+def _cell_info(situation_key):
+    _, action_key, action_color = DECISION_CELLS[situation_key]
+    return {'situation_key': situation_key, 'action_key': action_key, 'action_color': action_color}
+
+
+# Per code field: language-independent values, then translated values, of one distinct value
+ROW_FIELDS = {
+    'volatility': (
+        _volatility_info,
+        lambda v, t: {
+            'volatility_text': t.get(str(v).lower(), v) + " " + t['volatility'],
+            'calendar_risk_text': t.get(str(v).lower(), v),
+        },
+    ),
+    'price_movement': (_movement_info, lambda m, t: {'price_text': t[m.lower()]}),
+    'health_key': (
+        lambda h: {'health_key': h, 'health_color': HEALTH_COLORS[h]},
+        lambda h, t: {'health_text': t[h]},
+    ),
+    'momentum_signal': (
+        lambda s: {'momentum_signal': s, 'momentum': MOMENTUM_STYLES[s]},
+        lambda s, t: {
+            'momentum_title': t[MOMENTUM_STYLES[s]['title_key']],
+            'momentum_signal_text': t[MOMENTUM_STYLES[s]['signal_key']],
+        },
+    ),
+    'alert_risk': (
+        lambda a: {'alert_risk': a, 'alert_key': a.lower()},
+        lambda a, t: {'alert_risk_text': t[a.lower()]},
+    ),
+    'situation_key': (
+        _cell_info,
+        lambda c, t: {'situation_text': t[c], 'action_text': t[DECISION_CELLS[c][1]]},
+    ),
+}
+
+
+class ViewModel:
+    """Precomputed render values for every row of a PredictionStore
+
+    Rows are stored column-wise: one small integer code array per field,
+    indexing that field's distinct values. Derived and translated values
+    are tables over the distinct values, and advisories are keyed by the
+    (volatility, movement) code pair. `row()` assembles one date's dict.
+    """
+
+    def __init__(self, store, languages=None):
+        languages = list(languages or translations)
+        frame = store.frame
+
+        volatility = volatility_levels(frame['cvi_label'])
+        movement = price_movements(frame['price_movement'])
+        alert = alert_risk_levels(store.forecasts, frame['date'])
+        self.forecasts = _forecast_view(store.forecasts) if store.forecasts is not None else None
+
+        # Forecast window and cards come from the latest forecast run in the data
+        run = latest_forecast_run(store.forecasts)
+        if run is not None:
+            self.forecast_start = run['origin_date'].iloc[0].date()
+            self.forecast_end = run['target_date'].iloc[-1].date()
+            cards = run[run['horizon_days'] >= MIN_CARD_HORIZON].reset_index(drop=True)
+            self.forecast_cards = _forecast_view(cards)
+            card_days = cards['target_date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+            start_day = int(np.datetime64(self.forecast_start, 'D').astype(np.int64))
+            end_day = int(np.datetime64(self.forecast_end, 'D').astype(np.int64))
+            self.show_forecast = (store.days >= start_day) & (store.days <= end_day)
+            # Cards for a date are the targets still ahead of it: forecast_cards[first_card:]
+            self.first_card = np.searchsorted(card_days, store.days, side='left').astype(np.int32)
+        else:
+            self.forecast_start = self.forecast_end = None
+            self.forecast_cards = None
+            self.show_forecast = np.zeros(len(frame), dtype=bool)
+            self.first_card = np.zeros(len(frame), dtype=np.int32)
+
+        columns = {
+            'volatility': volatility,
+            'price_movement': movement,
+            'health_key': health_key(volatility),
+            'momentum_signal': momentum_signal(frame['price_momentum_7'], frame['price_momentum_3']),
+            'alert_risk': alert,
+            'situation_key': classify_situations(volatility, alert)['situation_key'].to_numpy(),
+        }
+        self.codes = {}
+        self.values = {}
+        self.info = {}
+        for field, values in columns.items():
+            self.codes[field], self.values[field] = _encode(values)
+            self.info[field] = [ROW_FIELDS[field][0](v) for v in self.values[field]]
+
+        # Translated text only depends on the distinct values (advisories on the pair)
+        pair_codes = set(zip(self.codes['volatility'].tolist(), self.codes['price_movement'].tolist()))
+        self.text = {}
+        self.advisories = {}
+        for language in languages:
+            t = translations[language]
+            self.text[language] = {
+                field: [ROW_FIELDS[field][1](v, t) for v in values]
+                for field, values in self.values.items()
+            }
+            self.advisories[language] = {
+                (vc, mc): get_advisory(self.values['volatility'][vc], self.values['price_movement'][mc], language)
+                for vc, mc in pair_codes
+            }
+
+    def __len__(self):
+        return len(self.show_forecast)
+
+    def row(self, position, language=None):
+        """Render values for one row; translated text and advisory too when `language` is given"""
+        row = {
+            'show_forecast': bool(self.show_forecast[position]),
+            'first_card': int(self.first_card[position]),
+        }
+        codes = {field: int(codes[position]) for field, codes in self.codes.items()}
+        for field, code in codes.items():
+            row.update(self.info[field][code])
+        if language is not None:
+            for field, code in codes.items():
+                row.update(self.text[language][field][code])
+            row['advisory'] = self.advisories[language][(codes['volatility'], codes['price_movement'])]
+        return row
+
+    def column(self, name, lo=0, hi=None):
+        """Values of one language-independent row field for rows lo:hi, as an array"""
+        for field, info in self.info.items():
+            if info and name in info[0]:
+                table = np.empty(len(info), dtype=object)
+                table[:] = [entry[name] for entry in info]
+                return table[self.codes[field][lo:hi]]
+        if name in ('show_forecast', 'first_card'):
+            return getattr(self, name)[lo:hi]
+        raise KeyError(name)
+
+
+_view_models = OrderedDict()
+_view_model_lock = threading.Lock()
+
+
+def view_model_for(store):
+    """Shared ViewModel for a store, built once per dataset version"""
+    with _view_model_lock:
+        if store.version in _view_models:
+            _view_models.move_to_end(store.version)
+            return _view_models[store.version]
+    view_model = ViewModel(store)
+    with _view_model_lock:
+        _view_models[store.version] = view_model
+        while len(_view_models) > VIEW_MODEL_CACHE_SIZE:
+            _view_models.popitem(last=False)
+    return view_model
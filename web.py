@@ -1,251 +1,16 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime, timedelta
 import numpy as np
-import ast
 
-
-translations = {
-    "English": {
-        "title": "Farmer's Commodity Volatility Index",
-        "select_date": "📅 Select Date",
-        "choose_date": "Choose prediction date",
-        "timeline": "Timeline (days)",
-        "market_analysis": "Market Analysis for",
-        "key_signals": "Key Market Signals",
-        "market_volatility": "Market Volatility",
-        "cvi_score": "CVI Score",
-        "price_direction": "Price Direction",
-        "momentum_7day": "7-Day Momentum",
-        "market_price": "Market Price",
-        "modal_price": "Modal Price (Most Common)",
-        "momentum_analysis": "Price Momentum & Volatility Analysis",
-        "key_indicators": "Key Indicators",
-        "price_momentum_7": "7-Day Price Momentum",
-        "price_momentum_3": "3-Day Price Momentum",
-        "volatility_7": "7-Day Volatility",
-        "volatility_30": "30-Day Volatility",
-        "momentum_interpretation": "Momentum Interpretation",
-        "volatility_probability": "Volatility Probability Distribution",
-        "low_volatility": "Low Volatility",
-        "med_volatility": "Med Volatility",
-        "high_volatility": "High Volatility",
-        "historical_trends": "Historical Market Trends",
-        "price_trend_analysis": "Price Trend Analysis",
-        "risk_summary": "Risk Level Summary",
-        "volatility_risk": "Volatility Risk",
-        "price_trend": "Price Trend",
-        "market_health": "Market Health",
-        "excellent": "Excellent",
-        "fair": "Fair",
-        "poor": "Poor",
-        "up": "Up",
-        "down": "Down",
-        "stable": "Stable",
-        "low": "Low",
-        "med": "Med",
-        "medium": "Medium",
-        "high": "High",
-        "dataset_info": "📊 Dataset Info",
-        "total_predictions": "Total Predictions",
-        "date_range": "Date Range",
-        "days": "days",
-        "cvi_distribution": "📈 CVI Distribution",
-        "high_cvi_days": "High CVI Days",
-        "med_cvi_days": "Med CVI Days",
-        "low_cvi_days": "Low CVI Days",
-        "about_cvi": "About CVI",
-        "multi_forecast": "Multi-Step Forecast",
-        "forecast_next_days": "Forecast for Next Days",
-        "forecasted_date": "Forecasted Date",
-        "predicted_volatility": "Predicted Volatility",
-        "confidence": "Confidence",
-        "view_details": "View Details",
-        "decision_matrix": "Decision Guide",
-        "situation": "Situation",
-        "farmer_action": "Recommended Action",
-        "calendar_risk": "Calendar Risk",
-        "alert_risk": "Alert Risk (3-7 days)",
-        "both_low": "Both LOW",
-        "seasonal_low_alert_high": "Seasonal LOW + Alert HIGH",
-        "seasonal_high_alert_low": "Seasonal HIGH + Alert LOW",
-        "both_high": "Both HIGH",
-        "sell_normally": "✓ Sell normally - Good conditions",
-        "be_cautious": "⚠ Be cautious, maybe wait - Short-term volatility expected",
-        "seasonal_risk_stable": "ℹ Seasonal risk exists, but market stable short-term",
-        "strong_warning": "⚠ Strong warning - Stagger sales or wait",
-        "calendar_risk": "Calendar Risk",
-        "alert_risk": "Alert Risk (3-7 days)",
-        "calendar_risk_desc":"Shows how risky this date usually is based on season, festivals, and past market patterns.",
-        "alert_risk_desc":"Short-term volatility risk based on recent market trends and predictions.",
-        "about_text": """**Commodity Volatility Index**,
-        
-            
-Measures market instability:
-- Low: Stable market
-- Medium: Moderate swings
-- High: Unstable prices
-
-Combined with price direction for better decisions.""",
-        "strong_upward": "Strong Upward Momentum Detected",
-        "strong_downward": "Strong Downward Momentum Detected",
-        "stable_movement": "Stable Price Movement",
-        "signal": "Signal",
-        "prices_rising": "Prices are rising consistently - Good time to sell if you need to",
-        "prices_falling": "Prices are falling - Hold if possible, avoid distress sales",
-        "no_strong_trend": "No strong directional trend - Standard market conditions",
-        "volatility": "Volatility",
-    },
-    "मराठी (Marathi)": {
-        "title": "शेतकऱ्यांचा कमोडिटी व्होलॅटिलिटी इंडेक्स",
-        "select_date": "📅 तारीख निवडा",
-        "choose_date": "अंदाज तारीख निवडा",
-        "timeline": "टाइमलाइन (दिवस)",
-        "market_analysis": "बाजार विश्लेषण",
-        "key_signals": "मुख्य बाजार संकेत",
-        "market_volatility": "बाजार अस्थिरता",
-        "cvi_score": "सीव्हीआय स्कोअर",
-        "price_direction": "किंमत दिशा",
-        "momentum_7day": "७-दिवस गती",
-        "market_price": "बाजार किंमत",
-        "modal_price": "मोडल किंमत (सर्वसाधारण)",
-        "momentum_analysis": "किंमत गती आणि अस्थिरता विश्लेषण",
-        "key_indicators": "मुख्य सूचक",
-        "price_momentum_7": "७-दिवस किंमत गती",
-        "price_momentum_3": "३-दिवस किंमत गती",
-        "volatility_7": "७-दिवस अस्थिरता",
-        "volatility_30": "३०-दिवस अस्थिरता",
-        "momentum_interpretation": "गती स्पष्टीकरण",
-        "volatility_probability": "अस्थिरता संभाव्यता वितरण",
-        "low_volatility": "कमी अस्थिरता",
-        "med_volatility": "मध्यम अस्थिरता",
-        "high_volatility": "उच्च अस्थिरता",
-        "historical_trends": "ऐतिहासिक बाजार ट्रेंड",
-        "price_trend_analysis": "किंमत ट्रेंड विश्लेषण",
-        "risk_summary": "जोखीम पातळी सारांश",
-        "volatility_risk": "अस्थिरता जोखीम",
-        "price_trend": "किंमत ट्रेंड",
-        "market_health": "बाजार आरोग्य",
-        "excellent": "उत्तम",
-        "fair": "चांगले",
-        "poor": "खराब",
-        "up": "वर",
-        "down": "खाली",
-        "stable": "स्थिर",
-        "low": "कमी",
-        "med": "मध्यम",
-        "medium": "मध्यम",
-        "high": "उच्च",
-        "dataset_info": "📊 डेटासेट माहिती",
-        "total_predictions": "एकूण अंदाज",
-        "date_range": "तारीख श्रेणी",
-        "days": "दिवस",
-        "cvi_distribution": "📈 सीव्हीआय वितरण",
-        "high_cvi_days": "उच्च सीव्हीआय दिवस",
-        "med_cvi_days": "मध्यम सीव्हीआय दिवस",
-        "low_cvi_days": "कमी सीव्हीआय दिवस",
-        "about_cvi": "सीव्हीआय बद्दल",
-        "multi_forecast": "बहु-चरण अंदाज",
-        "forecast_next_days": "पुढील दिवसांसाठी अंदाज",
-        "forecasted_date": "अंदाजित तारीख",
-        "predicted_volatility": "अंदाजित अस्थिरता",
-        "confidence": "आत्मविश्वास",
-        "view_details": "तपशील पहा",
-        "decision_matrix": "निर्णय मार्गदर्शक",
-        "situation": "परिस्थिती",
-        "farmer_action": "शिफारस केलेली कृती",
-        "calendar_risk": "हंगामी जोखीम",
-        "alert_risk": "सतर्कता जोखीम (३-७ दिवस)",
-        "both_low": "दोन्ही कमी",
-        "seasonal_low_alert_high": "हंगामी कमी + सतर्कता उच्च",
-        "seasonal_high_alert_low": "हंगामी उच्च + सतर्कता कमी",
-        "both_high": "दोन्ही उच्च",
-        "sell_normally": "✓ सामान्यपणे विका - चांगल्या परिस्थिती",
-        "be_cautious": "⚠ सावध रहा, कदाचित प्रतीक्षा करा - अल्पकालीन अस्थिरता अपेक्षित",
-        "seasonal_risk_stable": "ℹ हंगामी जोखीम अस्तित्वात आहे, परंतु बाजार अल्पकालीन स्थिर",
-        "strong_warning": "⚠ मजबूत चेतावणी - विक्री टप्प्याटप्प्याने करा किंवा प्रतीक्षा करा",
-        "calendar_risk": "कॅलेंडर जोखीम",
-        "alert_risk": "सतर्कता जोखीम (३-७ दिवस)",
-        "calendar_risk_desc":"हंगाम, सण आणि मागील बाजार पद्धतींवर आधारित ही तारीख सहसा किती धोकादायक असते हे दर्शविते.",
-        "alert_risk_desc":"अलिकडच्या किमतीतील चढउतार आणि अपेक्षित परिस्थितींवर आधारित अल्पकालीन बाजार अनिश्चितता दर्शवते.",
-        "about_text": """**कमोडिटी व्होलॅटिलिटी इंडेक्स**
-            
-बाजार अस्थिरता मोजते:
-- कमी: स्थिर बाजार
-- मध्यम: मध्यम बदल
-- उच्च: अस्थिर किंमती
-
-चांगल्या निर्णयांसाठी किंमत दिशेसह एकत्रित.""",
-        "strong_upward": "मजबूत वरच्या दिशेने गती आढळली",
-        "strong_downward": "मजबूत खालच्या दिशेने गती आढळली",
-        "stable_movement": "स्थिर किंमत हालचाल",
-        "signal": "संकेत",
-        "prices_rising": "किंमती सातत्याने वाढत आहेत - आवश्यक असल्यास विकण्यासाठी चांगली वेळ",
-        "prices_falling": "किंमती घसरत आहेत - शक्य असल्यास धरून ठेवा, घाईची विक्री टाळा",
-        "no_strong_trend": "कोणताही मजबूत दिशात्मक कल नाही - मानक बाजार परिस्थिती",
-        "volatility": "अस्थिरता",
-    }
-}
-
-# Marathi advisories
-advisories_marathi = {
-    ("High", "Up"): {
-        "title": "सावधगिरी: उच्च जोखीम, वाढणाऱ्या किंमती",
-        "message": "किंमती वाढत आहेत पण बाजार अत्यंत अस्थिर आहे. तातडीची विक्री टाळा पण तीव्र उलटसुलट होण्यासाठी तयार रहा.",
-        "action": "कृती: साठा ठेवा. दररोज निरीक्षण करा. किंमत लक्ष्य ठेवा. शिखरावर विकण्यास तयार रहा.",
-        "color": "#f59e0b"
-    },
-    ("High", "Down"): {
-        "title": "सावधानता: उच्च जोखीम, घटणाऱ्या किंमती",
-        "message": "अस्थिर परिस्थितीत किंमती घटत आहेत. सतत खालच्या दिशेने दबाव येण्याची उच्च शक्यता.",
-        "action": "कृती: घाबरून विक्री टाळा. शक्य असल्यास साठवा. बाजार स्थिर होण्याची प्रतीक्षा करा.",
-        "color": "#ef4444"
-    },
-    ("High", "Stable"): {
-        "title": "चेतावणी: उच्च अस्थिरता, अनिश्चित दिशा",
-        "message": "बाजार अस्थिर आहे आणि स्पष्ट दिशा नाही. दोन्ही दिशेने तीव्र किंमत बदल शक्य.",
-        "action": "कृती: सावध रहा. बारकाईने निरीक्षण करा. जलद बदलांसाठी तयार रहा. विक्री आणि होल्ड दोन्ही धोरणे ठेवा.",
-        "color": "#f59e0b"
-    },
-    ("Med", "Up"): {
-        "title": "अनुकूल: मध्यम जोखीम, वाढणाऱ्या किंमती",
-        "message": "व्यवस्थापन करण्यायोग्य अस्थिरतेसह किंमती वाढत आहेत. धोरणात्मक विक्रीसाठी चांगली संधी.",
-        "action": "कृती: साठ्याचा काही भाग विकण्याचा विचार करा. बाजार व्यवहारांसाठी चांगल्या परिस्थिती.",
-        "color": "#10b981"
-    },
-    ("Med", "Down"): {
-        "title": "सावधगिरी: मध्यम जोखीम, घटणाऱ्या किंमती",
-        "message": "मध्यम अस्थिरतेसह किंमती घटत आहेत. सावधगिरी बाळगा पण घाबरू नका.",
-        "action": "कृती: शक्य असल्यास साठा ठेवा. किंमत पुनर्प्राप्तीची प्रतीक्षा करा. उलटसुलट संकेतांसाठी निरीक्षण करा.",
-        "color": "#f59e0b"
-    },
-    ("Med", "Stable"): {
-        "title": "तटस्थ: मध्यम अस्थिरता, स्थिर किंमती",
-        "message": "स्थिर किंमतीसह बाजार मध्यम क्रियाकलाप दर्शवित आहे. व्यापारासाठी वाजवी परिस्थिती.",
-        "action": "कृती: सामान्य व्यापार परिस्थिती. मानक विक्री धोरणे लागू. नियोजित व्यवहारांसाठी चांगली वेळ.",
-        "color": "#6366f1"
-    },
-    ("Low", "Up"): {
-        "title": "इष्टतम: कमी जोखीम, वाढणाऱ्या किंमती",
-        "message": "सर्वोत्तम परिस्थिती! स्थिर वातावरणात किंमती वाढत आहेत. सतत वाढीसाठी उच्च आत्मविश्वास.",
-        "action": "कृती: उत्कृष्ट विक्री संधी. बाजार अनुकूल आहे. सध्याच्या दरावर विकण्याचा विचार करा.",
-        "color": "#10b981"
-    },
-    ("Low", "Down"): {
-        "title": "स्थिर: कमी जोखीम, घटणाऱ्या किंमती",
-        "message": "स्थिर परिस्थितीत किंमती हळूहळू घटत आहेत. नियंत्रित खालच्या दिशेने हालचाल.",
-        "action": "कृती: साठा ठेवा. किंमत स्थिरीकरणाची प्रतीक्षा करा. पुढील चक्रासाठी तयार होण्यासाठी चांगल्या परिस्थिती.",
-        "color": "#6366f1"
-    },
-    ("Low", "Stable"): {
-        "title": "आदर्श: कमी जोखीम, स्थिर किंमती",
-        "message": "किमान अस्थिरतेसह शांत बाजार. सर्व व्यापार क्रियाकलापांसाठी सुरक्षित वातावरण.",
-        "action": "कृती: शेती कार्यांसाठी आदर्श परिस्थिती. कमी जोखीम वातावरण. नियोजित विक्रीसह पुढे जाणे सुरक्षित.",
-        "color": "#10b981"
-    }
-}
+import profiling
+from assets import stylesheet_html
+from catalog import PARTITION_CACHE_SIZE, Catalog, display_name
+from charts import create_gauge_panel, create_momentum_chart, history_figure
+from features import (DEFAULT_MOMENTUM_WINDOWS, DEFAULT_VOLATILITY_WINDOWS, MAX_WINDOW, momentum_column,
+                      price_column, volatility_column)
+from lite import prefers_lite, probability_bars, sparkline_svg
+from translations import translations
+from view_model import MOMENTUM_STYLES, VOLATILITY_NUMERIC, ViewModel, momentum_signal
 
 # Page configuration
 st.set_page_config(
@@ -255,224 +20,25 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for modern aesthetics + Mobile fix
-st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;700&display=swap');
-    
-    * {
-        font-family: 'Inter', sans-serif;
-    }
-    
-    /* Prevent sidebar from closing on mobile */
-    [data-testid="stSidebar"] {
-        position: relative !important;
-    }
-    
-    [data-testid="stSidebar"][aria-expanded="true"] {
-        min-width: 300px !important;
-        max-width: 300px !important;
-    }
-    
-    /* Make date input more mobile-friendly */
-    .stDateInput {
-        z-index: 9999 !important;
-    }
-    
-    .stDateInput > div {
-        z-index: 9999 !important;
-    }
-    
-    /* Calendar popup should stay above sidebar */
-    .react-datepicker-popper {
-        z-index: 10000 !important;
-    }
-    
-    .react-datepicker {
-        z-index: 10000 !important;
-    }
-    
-    .main {
-        background: linear-gradient(135deg, #1e3c72 0%, #2a5298 50%, #7e22ce 100%);
-        padding: 2rem;
-    }
-    
-    .stApp {
-        background: transparent;
-    }
-    
-    .metric-card {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(20px);
-        border-radius: 20px;
-        padding: 2rem;
-        box-shadow: 0 8px 32px rgba(31, 38, 135, 0.37);
-        border: 1px solid rgba(255, 255, 255, 0.18);
-        margin-bottom: 1rem;
-        transition: all 0.3s ease;
-    }
-    
-    .metric-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 12px 40px rgba(31, 38, 135, 0.5);
-        background: rgba(255, 255, 255, 0.15);
-    }
-    
-    .advisory-card {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(20px);
-        border-radius: 20px;
-        padding: 2rem;
-        box-shadow: 0 8px 32px rgba(31, 38, 135, 0.37);
-        border-left: 6px solid;
-        border: 1px solid rgba(255, 255, 255, 0.18);
-        margin: 1rem 0;
-    }
-    
-    .volatility-badge {
-        display: inline-block;
-        padding: 0.5rem 1.5rem;
-        border-radius: 50px;
-        font-weight: 600;
-        font-size: 1.2rem;
-        margin: 1rem 0;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.2);
-    }
-    
-    .price-badge {
-        display: inline-flex;
-        align-items: center;
-        gap: 0.5rem;
-        padding: 0.5rem 1.5rem;
-        border-radius: 50px;
-        font-weight: 600;
-        font-size: 1.2rem;
-        margin: 1rem 0;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.2);
-    }
-    
-    .low-volatility {
-        background: linear-gradient(135deg, #10b981 0%, #059669 100%);
-        color: white;
-    }
-    
-    .med-volatility, .medium-volatility {
-        background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%);
-        color: #2d3748;
-    }
-    
-    .high-volatility {
-        background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%);
-        color: white;
-    }
-    
-    .price-up {
-        background: linear-gradient(135deg, #10b981 0%, #059669 100%);
-        color: white;
-    }
-    
-    .price-down {
-        background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%);
-        color: white;
-    }
-    
-    .price-stable {
-        background: linear-gradient(135deg, #6366f1 0%, #4f46e5 100%);
-        color: white;
-    }
-    
-    h1 {
-        color: white !important;
-        font-weight: 700 !important;
-        text-align: center;
-        margin-bottom: 2rem !important;
-        font-size: 3rem !important;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-    }
-    
-    h2, h3 {
-        color: white !important;
-        font-weight: 600 !important;
-    }
-    
-    .metric-card h3 {
-        color: #e0e7ff !important;
-    }
-    
-    .metric-card p {
-        color: #d1d5db !important;
-    }
-    
-    .stButton>button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        padding: 0.75rem 2rem;
-        border-radius: 50px;
-        font-weight: 600;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.2);
-    }
-    
-    .stButton>button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(0, 0, 0, 0.3);
-    }
-    
-    .info-box {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(20px);
-        border-left: 5px solid #667eea;
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-        border: 1px solid rgba(255, 255, 255, 0.18);
-    }
-    
-    .info-box h2 {
-        color: white !important;
-    }
-    
-    .risk-indicator {
-        padding: 1rem;
-        border-radius: 15px;
-        margin: 0.5rem 0;
-        font-weight: 600;
-        text-align: center;
-        font-size: 1.1rem;
-    }
-    
-    /* Mobile optimizations */
-    @media (max-width: 768px) {
-        h1 {
-            font-size: 2rem !important;
-        }
-        
-        .metric-card, .advisory-card {
-            padding: 1rem;
-        }
-        
-        .volatility-badge, .price-badge {
-            font-size: 1rem;
-            padding: 0.4rem 1rem;
-        }
-        
-      
-    }
-    </style>
-""", unsafe_allow_html=True)
+# Opt-in render timing: CVI_PROFILE=1 or ?profile=1
+profiling_on = profiling.ENABLED or st.query_params.get("profile") == "1"
+run = profiling.start_run("page", profiling_on)
 
-@st.cache_data
-def load_predictions(file_path='2025_predictions.csv'):
-    """Load the predictions CSV file"""
+# Custom CSS for modern aesthetics + Mobile fix
+st.markdown(stylesheet_html(st.get_option("server.enableStaticServing")), unsafe_allow_html=True)
+run.lap("css")
+
+@st.cache_resource
+def load_catalog():
+    """Scan the partitioned data layout once per process and watch it for changes"""
+    catalog = Catalog()
+    catalog.watch()
+    return catalog
+
+def load_store(catalog, commodity, market):
+    """Date-indexed store for one partition, loaded lazily and LRU-cached"""
     try:
-        df = pd.read_csv(file_path)
-        df['date'] = pd.to_datetime(df['date'])
-        return df
+        return catalog.load(commodity, market)
     except FileNotFoundError:
         st.error("Predictions file not found. Please ensure '2025_predictions.csv' is in the same directory.")
         return None
@@ -480,331 +46,142 @@ def load_predictions(file_path='2025_predictions.csv'):
         st.error(f"Error loading predictions: {str(e)}")
         return None
 
-def determine_price_movement_from_column(price_movement_str):
-    """Extract price movement from the price_movement column"""
-    if pd.isna(price_movement_str):
-        return "Stable"
-    
-    movement = str(price_movement_str).strip().lower()
-    
-    if 'up' in movement:
-        return "Up"
-    elif 'down' in movement:
-        return "Down"
-    else:
-        return "Stable"
-
-def get_advisory(volatility, price_movement, language="English"):
-    """Generate actionable advisory based on volatility and price movement"""
-    advisories = {
-        ("High", "Up"): {
-            "title": "CAUTION: High Risk, Rising Prices",
-            "message": "Commodity prices are rising but market is highly unstable. Avoid distress sales but be prepared for sharp reversals.",
-            "action": "Action: Hold inventory. Monitor daily. Set price targets. Be ready to sell on peaks.",
-            "color": "#f59e0b"
-        },
-        ("High", "Down"): {
-            "title": "ALERT: High Risk, Falling Prices",
-            "message": "Prices declining in volatile conditions. High probability of continued downward pressure.",
-            "action": "Action: Avoid panic selling. Store if possible. Wait for market stabilization.",
-            "color": "#ef4444"
-        },
-        ("High", "Stable"): {
-            "title": "WARNING: High Volatility, Uncertain Direction",
-            "message": "Market is unstable with no clear direction. Sharp price movements possible in either direction.",
-            "action": "Action: Stay cautious. Monitor closely. Prepare for rapid changes. Have both sell and hold strategies ready.",
-            "color": "#f59e0b"
-        },
-        ("Med", "Up"): {
-            "title": "FAVORABLE: Moderate Risk, Rising Prices",
-            "message": "Prices trending upward with manageable volatility. Good opportunity for strategic selling.",
-            "action": "Action: Consider selling portion of inventory. Good conditions for market transactions.",
-            "color": "#10b981"
-        },
-        ("Med", "Down"): {
-            "title": "CAUTION: Moderate Risk, Declining Prices",
-            "message": "Prices falling with moderate volatility. Exercise caution but not panic.",
-            "action": "Action: Hold inventory if possible. Wait for price recovery. Monitor for reversal signals.",
-            "color": "#f59e0b"
-        },
-        ("Med", "Stable"): {
-            "title": "NEUTRAL: Moderate Volatility, Stable Prices",
-            "message": "Market showing moderate activity with stable pricing. Reasonable conditions for trading.",
-            "action": "Action: Normal trading conditions. Standard selling strategies apply. Good time for planned transactions.",
-            "color": "#6366f1"
-        },
-        ("Low", "Up"): {
-            "title": "OPTIMAL: Low Risk, Rising Prices",
-            "message": "Best conditions! Prices rising in a stable environment. High confidence for continued growth.",
-            "action": "Action: Excellent selling opportunity. Market is favorable. Consider selling at current rates.",
-            "color": "#10b981"
-        },
-        ("Low", "Down"): {
-            "title": "STABLE: Low Risk, Declining Prices",
-            "message": "Prices declining gradually in stable conditions. Controlled downward movement.",
-            "action": "Action: Hold inventory. Wait for price stabilization. Good conditions to prepare for next cycle.",
-            "color": "#6366f1"
-        },
-        ("Low", "Stable"): {
-            "title": "IDEAL: Low Risk, Stable Prices",
-            "message": "Calm market with minimal volatility. Safe environment for all trading activities.",
-            "action": "Action: Ideal conditions for farming operations. Low risk environment. Safe to proceed with planned sales.",
-            "color": "#10b981"
-        }
-    }
-    
-    # Handle Medium label
-    key = (volatility, price_movement)
-    if volatility == "Medium":
-        key = ("Med", price_movement)
-    
-    # Use Marathi advisories if language is Marathi
-    if language == "मराठी (Marathi)":
-        return advisories_marathi.get(key, advisories_marathi[("Med", "Stable")])
-    
-    return advisories.get(key, advisories[("Med", "Stable")])
-
-def create_volatility_timeline(df, current_date, days_back=30, t=None):
-    """Create volatility timeline chart"""
-    if t is None:
-        t = translations["English"]
-    
-    end_date = pd.to_datetime(current_date)
-    start_date = end_date - timedelta(days=days_back)
-    
-    timeline_df = df[(df['date'] >= start_date) & (df['date'] <= end_date)].copy()
-    
-    label_map = {'Low': 1, 'Med': 2, 'Medium': 2, 'High': 3}
-    timeline_df['volatility_numeric'] = timeline_df['cvi_label'].map(label_map)
-    
-    fig = go.Figure()
-    
-    colors = {'Low': '#10b981', 'Med': '#f59e0b', 'Medium': '#f59e0b', 'High': '#ef4444'}
-    
-    for label in timeline_df['cvi_label'].unique():
-        data = timeline_df[timeline_df['cvi_label'] == label]
-        if not data.empty:
-            label_key = label.lower() if label.lower() in ['low', 'high'] else 'med'
-            volatility_label = t[f'{label_key}_volatility']
-            fig.add_trace(go.Scatter(
-                x=data['date'],
-                y=data['volatility_numeric'],
-                mode='markers+lines',
-                name=volatility_label,
-                marker=dict(size=10, color=colors.get(label, '#6366f1')),
-                line=dict(color=colors.get(label, '#6366f1'), width=3),
-                hovertemplate=f'<b>{volatility_label}</b><br>Date: %{{x|%b %d}}<br>CVI: %{{customdata:.4f}}<extra></extra>',
-                customdata=data['cvi_score']
-            ))
-    
-    fig.update_layout(
-        title=f"{days_back}-{t['days']} {t['historical_trends']}",
-        xaxis_title=t['date_range'],
-        yaxis_title=t['market_volatility'],
-        height=400,
-        paper_bgcolor='rgba(0, 0, 0, 0.3)',
-        plot_bgcolor='rgba(0, 0, 0, 0.2)',
-        font={'family': 'Inter', 'size': 12, 'color': 'white'},
-        hovermode='closest',
-        yaxis=dict(
-            tickmode='array',
-            tickvals=[1, 2, 3],
-            ticktext=['Low', 'Medium', 'High'],
-            gridcolor='rgba(255, 255, 255, 0.1)',
-            color='white'
-        ),
-        xaxis=dict(
-            gridcolor='rgba(255, 255, 255, 0.1)',
-            color='white'
-        ),
-        showlegend=True,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1,
-            font={'color': 'white'}
-        ),
-        title_font={'color': 'white'}
-    )
-    return fig
-
-def create_cvi_trend_chart(df, current_date, days_back=30, t=None):
-    """Create CVI score trend chart"""
-    if t is None:
-        t = translations["English"]
-    end_date = pd.to_datetime(current_date)
-    start_date = end_date - timedelta(days=days_back)
-
-    trend_df = df[(df['date'] >= start_date) & (df['date'] <= end_date)].copy()
-
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=trend_df['date'],
-        y=trend_df['cvi_score'],
-        mode='lines+markers',
-        name=t['cvi_score'],
-        line=dict(color='#667eea', width=3),
-        marker=dict(size=8, color='#764ba2'),
-        fill='tozeroy',
-        fillcolor='rgba(102, 126, 234, 0.2)',
-        hovertemplate=f"<b>{t['cvi_score']}</b><br>Date: %{{x|%b %d}}<br>Score: %{{y:.4f}}<extra></extra>"
-    ))
-
-    fig.add_hline(y=33, line_dash="dash", line_color="#10b981",
-                  annotation_text=f"{t['low']} Threshold", annotation_position="right")
-    fig.add_hline(y=66, line_dash="dash", line_color="#f59e0b",
-                  annotation_text=f"{t['high']} Threshold", annotation_position="right")
-
-    fig.update_layout(
-        title=f"{days_back}-{t['days']} {t['cvi_score']} {t['price_trend']}",
-        xaxis_title=t['date_range'],
-        yaxis_title=t['cvi_score'],
-        height=400,
-        paper_bgcolor='rgba(0, 0, 0, 0.3)',
-        plot_bgcolor='rgba(0, 0, 0, 0.2)',
-        font={'family': 'Inter', 'size': 12, 'color': 'white'},
-        hovermode='x unified',
-        xaxis=dict(
-            gridcolor='rgba(255, 255, 255, 0.1)',
-            color='white'
-        ),
-        yaxis=dict(
-            gridcolor='rgba(255, 255, 255, 0.1)',
-            color='white'
-        )
-    )
-
-    return fig
-
-def create_momentum_chart(m7, m3, vol7, vol30):
-    """Create price momentum comparison chart"""
-    fig = go.Figure()
-    
-    categories = ['7-Day<br>Momentum', '3-Day<br>Momentum', '7-Day<br>Volatility', '30-Day<br>Volatility']
-    values = [m7, m3, vol7, vol30]
-    colors = ['#10b981' if v >= 0 else '#ef4444' for v in values]
-    
-    fig.add_trace(go.Bar(
-        x=categories,
-        y=values,
-        marker_color=colors,
-        text=[f"{v:+.2f}%" for v in values],
-        textposition='outside',
-        textfont=dict(color='white'),
-        hovertemplate='<b>%{x}</b><br>Value: %{y:.2f}%<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title="Price Momentum & Volatility Indicators",
-        xaxis_title="Indicator",
-        yaxis_title="Percentage (%)",
-        height=400,
-        paper_bgcolor='rgba(0, 0, 0, 0.3)',
-        plot_bgcolor='rgba(0, 0, 0, 0.2)',
-        font={'family': 'Inter', 'size': 12, 'color': 'white'},
-        xaxis=dict(
-            gridcolor='rgba(255, 255, 255, 0.1)',
-            color='white'
-        ),
-        yaxis=dict(
-            gridcolor='rgba(255, 255, 255, 0.1)',
-            color='white'
-        ),
-        title_font={'color': 'white'}
-    )
+# Timeline choices, from a week up to five seasons
+TIMELINE_DAYS = [7, 14, 30, 60, 90, 180, 365, 730, 1825]
+
+@st.cache_resource(max_entries=PARTITION_CACHE_SIZE)
+def load_view_model(_store, version):
+    """Per-date render model for a store, built once per dataset version"""
+    return ViewModel(_store)
+
+@st.fragment
+def render_history_section(store, selected_date, language, lite=False):
+    """Historical charts and their timeline slider.
+
+    Runs as a fragment: moving the slider reruns only this section, while a
+    new date, language or dataset reruns the whole page as usual. In lite
+    mode the charts are replaced by one server-rendered SVG sparkline.
+    """
+    # A slider move reruns only this fragment, which then gets its own timing run
+    fragment_run = profiling.NULL_RUN
+    if profiling.active_run() is None:
+        fragment_run = profiling.start_run("history_fragment", profiling_on)
+    t = translations[language]
+    st.markdown(f"## {t['historical_trends']}")
     
-    fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
+    timeline_days = st.select_slider(t['timeline'], options=TIMELINE_DAYS, value=30, key="timeline_slider")
+    
+    # Window aggregates come from the store's prefix sums, whatever the window length
+    stats = store.window_stats(selected_date, timeline_days)
+    stat_cols = st.columns(4)
+    stat_cols[0].metric(t['mean_cvi'], f"{stats['mean_cvi']:.2f}" if stats['mean_cvi'] is not None else "-")
+    stat_cols[1].metric(t['high_cvi_days'], stats['high_days'])
+    stat_cols[2].metric(t['med_cvi_days'], stats['med_days'])
+    stat_cols[3].metric(t['low_cvi_days'], stats['low_days'])
+    
+    if lite:
+        rows = store.window(selected_date, timeline_days)
+        days = rows['date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        levels = rows['cvi_label'].astype(object).map(VOLATILITY_NUMERIC).to_numpy(dtype=float)
+        title = f"{timeline_days}-{t['days']} {t['cvi_score']}"
+        st.markdown(sparkline_svg(days, rows['cvi_score'].to_numpy(), levels, title), unsafe_allow_html=True)
+        fragment_run.finish()
+        return
     
-    return fig
-
-def parse_multi_forecast(multi_next_str):
-    """Parse the multi_next column string into a dictionary"""
-    import ast
-    try:
-        if pd.isna(multi_next_str):
-            return None
-        # Convert string representation to dictionary
-        forecast_dict = ast.literal_eval(multi_next_str)
-        return forecast_dict
-    except:
-        return None
-
-def should_show_forecast(df, selected_date):
-    """Check if multi-step forecast should be shown only between Dec 13 and Dec 20, 2024 (inclusive)."""
-    try:
-        if selected_date is None:
-            return False
-        sel_date = pd.to_datetime(selected_date).date()
-        start_date = pd.to_datetime("2024-12-15").date()
-        end_date = pd.to_datetime("2025-12-22").date()
-        return start_date <= sel_date <= end_date
-    except Exception:
-        return False
-
-def get_alert_risk_level(forecast_data):
-    """Determine alert risk based on 3-day and 7-day forecasts"""
-    if not forecast_data:
-        return "Low"
+    col1, col2 = st.columns(2)
     
-    # Check 3-day and 7-day forecasts
-    labels = []
-    for date_str in sorted(forecast_data.keys()):
-        forecast_info = forecast_data[date_str]
-        labels.append(forecast_info['label'])
+    with col1:
+        fig_timeline = history_figure("timeline", store, selected_date, timeline_days, language)
+        st.plotly_chart(fig_timeline, use_container_width=True)
     
-    # If any forecast is High, alert is High
-    if 'High' in labels:
-        return "High"
-    # If any forecast is Med/Medium, alert is Med
-    elif 'Med' in labels or 'Medium' in labels:
-        return "Med"
-    else:
-        return "Low"
+    with col2:
+        fig_cvi = history_figure("cvi_trend", store, selected_date, timeline_days, language)
+        st.plotly_chart(fig_cvi, use_container_width=True)
+    fragment_run.finish()
 
 # Main App
 if 'language' not in st.session_state:
     st.session_state.language = "English"
 
 st.markdown(f"<h1>{translations[st.session_state.language]['title']}</h1>", unsafe_allow_html=True)
-df = load_predictions()
-if df is not None:
-    # Sidebar with language selection
-    with st.sidebar:
-        st.markdown("### 🌐 Language / भाषा")
-        language = st.radio(
-            "Select Language",
-            options=["English", "मराठी (Marathi)"],
-            index=0 if st.session_state.language == "English" else 1,
-            key="lang_radio"
+catalog = load_catalog()
+commodity, market = catalog.default_partition
+# Sidebar with language selection
+with st.sidebar:
+    st.markdown("### 🌐 Language / भाषा")
+    language = st.radio(
+        "Select Language",
+        options=list(translations),
+        index=list(translations).index(st.session_state.language),
+        key="lang_radio"
+    )
+    # Update session state when language changes
+    if language != st.session_state.language:
+        st.session_state.language = language
+        st.rerun()
+    
+    st.markdown("---")
+    
+    # Get translations for selected language - MOVED HERE
+    t = translations[language]
+    
+    # Lite mode: no Plotly figures, for slow connections and low-end phones
+    lite_mode = st.toggle(
+        t['lite_mode'],
+        value=prefers_lite(st.context.headers, st.query_params),
+        key="lite_mode",
+        help="HTML bars and a small sparkline instead of interactive charts"
+    )
+    if catalog.is_partitioned:
+        st.markdown(f"### 🧺 {t['dataset']}")
+        commodity = st.selectbox(
+            t['commodity'],
+            options=catalog.commodities(),
+            format_func=display_name,
+            key="commodity_select"
+        )
+        market = st.selectbox(
+            t['market'],
+            options=catalog.markets(commodity),
+            format_func=display_name,
+            key="market_select"
         )
-     # Update session state when language changes
-        if language != st.session_state.language:
-            st.session_state.language = language
-            st.rerun()
-        
         st.markdown("---")
-        
-        # Get translations for selected language - MOVED HERE
-        t = translations[language]
-        
-        st.markdown(f"### ℹ️ {t['about_cvi']}")
-        st.info(t['about_text'])
+    
+    st.markdown(f"### ℹ️ {t['about_cvi']}")
+    st.info(t['about_text'])
+run.lap("sidebar")
 
 # Get translations for current language
 t = translations[st.session_state.language]
 
+store = load_store(catalog, commodity, market)
+if store is None:
+    st.stop()
 # Date selector moved to main area
 st.markdown(f"## {t['select_date']}")
 
-min_date = df['date'].min().date()
-max_date = df['date'].max().date()
+min_date = store.min_date
+max_date = store.max_date
+
+with st.sidebar:
+    st.markdown("---")
+    st.markdown(f"### {t['dataset_info']}")
+    st.metric(t['total_predictions'], len(store))
+    st.caption(f"{t['date_range']}: {min_date.strftime('%b %d, %Y')} – {max_date.strftime('%b %d, %Y')}")
+    distribution = store.window_stats(max_date, store.last_day - store.first_day)
+    st.markdown(f"### {t['cvi_distribution']}")
+    st.metric(t['high_cvi_days'], distribution['high_days'])
+    st.metric(t['med_cvi_days'], distribution['med_days'])
+    st.metric(t['low_cvi_days'], distribution['low_days'])
+
+# A different partition may not cover the previously selected date
+if "date_selector" in st.session_state and not (min_date <= st.session_state.date_selector <= max_date):
+    del st.session_state["date_selector"]
 
-col1, col2, col3 = st.columns([2, 2, 3])
+date_col, _ = st.columns([2, 5])
 
-with col1:
+with date_col:
     selected_date = st.date_input(
         t['choose_date'],
         value=min_date,
@@ -814,17 +191,16 @@ with col1:
         help="Select a date to view market predictions"
     )
 
-with col2:
-    timeline_days = st.slider(t['timeline'], 7, 60, 30, key="timeline_slider")
-
 st.markdown("---")
 
-prediction = df[df['date'].dt.date == selected_date]
+position = store.position(selected_date)
 
-if not prediction.empty:
-    pred = prediction.iloc[0]
+if position >= 0:
+    pred = store.frame.iloc[position]
+    view_model = load_view_model(store, store.version)
+    view = view_model.row(position, st.session_state.language)
+    run.lap("data_lookup")
     
-    volatility = pred['cvi_label']
     cvi_score = pred['cvi_score']
     prob_low = pred['prob_low']
     prob_med = pred['prob_med']
@@ -833,10 +209,7 @@ if not prediction.empty:
     m3 = pred['price_momentum_3']
     vol7 = pred['vol_7']
     vol30 = pred['vol_30']
-    
-    price_movement = determine_price_movement_from_column(pred['price_movement'])
-    
-    advisory = get_advisory(volatility, price_movement, st.session_state.language)
+    advisory = view['advisory']
     
     st.markdown(f"<div class='info-box'><h2 style='margin:0;'>{t['market_analysis']} {selected_date.strftime('%B %d, %Y')}</h2></div>", unsafe_allow_html=True)
     
@@ -855,12 +228,10 @@ if not prediction.empty:
     col1, col2 = st.columns(2)
     
     with col1:
-        volatility_class = f"{volatility.lower()}-volatility"
-        volatility_text = t[volatility.lower()] + " " + t['volatility']
         st.markdown(f"""
             <div class="metric-card">
                 <h3 style="margin-top: 0; color: #667eea;">{t['market_volatility']}</h3>
-                <div class='volatility-badge {volatility_class}'>{volatility_text}</div>
+                <div class='volatility-badge {view['volatility_class']}'>{view['volatility_text']}</div>
                 <p style="color: #718096; margin-top: 1rem; font-size: 1.1rem;">
                     <strong>{t['cvi_score']}:</strong> {cvi_score:.4f}
                 </p>
@@ -868,12 +239,10 @@ if not prediction.empty:
         """, unsafe_allow_html=True)
     
     with col2:
-        price_class = f"price-{price_movement.lower()}"
-        price_text = t[price_movement.lower()]
         st.markdown(f"""
             <div class="metric-card">
                 <h3 style="margin-top: 0; color: #667eea;">{t['price_direction']}</h3>
-                <div class='price-badge {price_class}'>{price_text}</div>
+                <div class='price-badge {view['price_class']}'>{view['price_text']}</div>
                 <p style="color: #718096; margin-top: 1rem; font-size: 1.1rem;">
                     <strong>{t['momentum_7day']}:</strong> {m7:+.2f}%
                 </p>
@@ -891,328 +260,191 @@ if not prediction.empty:
             </div>
         </div>
     """, unsafe_allow_html=True)
+    run.lap("signals_advisory")
     # Decision Matrix Section
-        
-        # Get calendar risk (from CVI label)
-    calendar_risk = volatility
-        
-        # Get alert risk from multi-step forecast if available
-    alert_risk = "Low"
-    if should_show_forecast(df, selected_date) and 'multi_next' in df.columns and pd.notna(pred.get('multi_next')):
-        forecast_data = parse_multi_forecast(pred['multi_next'])
-        
-        sel_date = pd.to_datetime(selected_date).date()
-
-        forecast_18 = pd.to_datetime("2025-12-18").date()
-        forecast_22 = pd.to_datetime("2025-12-22").date()
-
-        selected_dates = []
-
-        # From Dec 13 to Dec 16 → show 16 & 20
-        if pd.to_datetime("2025-12-15").date() <= sel_date <= pd.to_datetime("2025-12-18").date():
-            if str(forecast_18) in forecast_data:
-                selected_dates.append(str(forecast_18))
-            if str(forecast_22) in forecast_data:
-                selected_dates.append(str(forecast_22))
-
-        # From Dec 17 to Dec 20 → show only 20
-        elif pd.to_datetime("2025-12-19").date() <= sel_date <= pd.to_datetime("2025-12-22").date():
-            if str(forecast_22) in forecast_data:
-                selected_dates.append(str(forecast_22))
-
-        # Only proceed to display forecasts if we have selected dates
-        if selected_dates:
-
-            # Display forecasts
-            for forecast_date_str in selected_dates:
-                # Get forecast info for this selected date
-                forecast_info = forecast_data[forecast_date_str]
-                f_label = forecast_info['label']
-                f_proba = forecast_info['proba']
-                f_score = forecast_info['score']
-                
-                # Determine which probability corresponds to the label
-                if f_label == 'Low':
-                    confidence = f_proba[0] * 100
-                elif f_label in ['Med', 'Medium']:
-                    confidence = f_proba[1] * 100
-                else:  # High
-                    confidence = f_proba[2] * 100
-                
-                # Color based on forecast label
-                label_colors = {'Low': '#10b981', 'Med': '#f59e0b', 'Medium': '#f59e0b', 'High': '#ef4444'}
-                forecast_color = label_colors.get(f_label, '#6366f1')
-                
-                # Display forecast card
-                col1, col2, col3, col4 = st.columns([2, 2, 2, 2])
-                
-                with col1:
-                    st.markdown(f"""
-                        <div class="metric-card" style="text-align: center; padding: 1rem;">
-                            <p style="color: #a0aec0; margin: 0; font-size: 0.9rem;">{t['forecasted_date']}</p>
-                            <p style="font-size: 1.3rem; font-weight: 600; color: white; margin: 0.5rem 0;">
-                                {pd.to_datetime(forecast_date_str).strftime('%b %d, %Y')}
-                            </p>
-                        </div>
-                    """, unsafe_allow_html=True)
-                
-                with col2:
-                    volatility_text = t[f_label.lower()] + " " + t['volatility']
-                    st.markdown(f"""
-                        <div class="metric-card" style="text-align: center; padding: 1rem;">
-                            <p style="color: #a0aec0; margin: 0; font-size: 0.9rem;">{t['predicted_volatility']}</p>
-                            <p style="font-size: 1.3rem; font-weight: 700; color: {forecast_color}; margin: 0.5rem 0;">
-                                {volatility_text}
-                            </p>
-                        </div>
-                    """, unsafe_allow_html=True)
-                
-                with col3:
-                    st.markdown(f"""
-                        <div class="metric-card" style="text-align: center; padding: 1rem;">
-                            <p style="color: #a0aec0; margin: 0; font-size: 0.9rem;">{t['cvi_score']}</p>
-                            <p style="font-size: 1.3rem; font-weight: 600; color: white; margin: 0.5rem 0;">
-                                {f_score:.2f}
-                            </p>
-                        </div>
-                    """, unsafe_allow_html=True)
-                
-                with col4:
-                    st.markdown(f"""
-                        <div class="metric-card" style="text-align: center; padding: 1rem;">
-                            <p style="color: #a0aec0; margin: 0; font-size: 0.9rem;">{t['confidence']}</p>
-                            <p style="font-size: 1.3rem; font-weight: 700; color: {forecast_color}; margin: 0.5rem 0;">
-                                {confidence:.1f}%
-                            </p>
-                        </div>
-                    """, unsafe_allow_html=True)
-                
-                # Expander for detailed probabilities
-                with st.expander(f"📊 {t['view_details']} - {pd.to_datetime(forecast_date_str).strftime('%b %d, %Y')}"):
-                    prob_cols = st.columns(3)
-                    
-                    prob_labels = [t['low_volatility'], t['med_volatility'], t['high_volatility']]
-                    prob_colors = ['#10b981', '#f59e0b', '#ef4444']
-                    
-                    for idx, (prob, label, color) in enumerate(zip(f_proba, prob_labels, prob_colors)):
-                        with prob_cols[idx]:
-                            fig = go.Figure(go.Indicator(
-                                mode="gauge+number",
-                                value=prob * 100,
-                                domain={'x': [0, 1], 'y': [0, 1]},
-                                title={'text': label, 'font': {'size': 14, 'color': 'white'}},
-                                number={'suffix': "%", 'font': {'size': 24, 'color': 'white'}},
-                                gauge={
-                                    'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': 'white'},
-                                    'bar': {'color': color, 'thickness': 0.75},
-                                    'bgcolor': "rgba(0, 0, 0, 0.2)",
-                                    'borderwidth': 2,
-                                    'bordercolor': "rgba(255, 255, 255, 0.2)",
-                                }
-                            ))
-                            
-                            fig.update_layout(
-                                height=200,
-                                margin=dict(l=10, r=10, t=40, b=10),
-                                paper_bgcolor='rgba(0, 0, 0, 0.3)',
-                                font={'family': 'Inter', 'color': 'white'}
-                            )
-                            
-                            st.plotly_chart(fig, use_container_width=True)
-            show_decision_guide = len(selected_dates) > 0
-            # After displaying forecasts, determine alert risk from forecast_data
-            if forecast_data:
-                alert_risk = get_alert_risk_level(forecast_data)
-            else:
-                alert_risk = "Low"
-
-    # Determine situation and action
-        sel_date = pd.to_datetime(selected_date).date()
-        start_range = pd.to_datetime("2025-12-15").date()
-        end_range = pd.to_datetime("2025-12-22").date()
-
-        # Only render the Decision Matrix when selected date is between 13-12-2025 and 20-12-2025
-        if start_range <= sel_date <= end_range:
-            st.markdown(f"## {t['decision_matrix']}")
-            if calendar_risk in ['Low'] and alert_risk in ['Low']:
-                situation = t['both_low']
-                action = t['sell_normally']
-                action_color = "#10b981"
-            elif calendar_risk in ['Low'] and alert_risk in ['Med', 'Medium', 'High']:
-                situation = t['seasonal_low_alert_high']
-                action = t['be_cautious']
-                action_color = "#f59e0b"
-            elif calendar_risk in ['Med', 'Medium', 'High'] and alert_risk in ['Low']:
-                situation = t['seasonal_high_alert_low']
-                action = t['seasonal_risk_stable']
-                action_color = "#6366f1"
-            else:
-                situation = t['both_high']
-                action = t['strong_warning']
-                action_color = "#ef4444"
-
-            col1, col2 = st.columns(2)
-
+    if view['show_forecast']:
+        # Forecast cards for the targets still ahead of the selected date
+        cards = view_model.forecast_cards.iloc[view['first_card']:]
+        for _, forecast_info in cards.iterrows():
+            forecast_date = forecast_info['target_date']
+            f_label = forecast_info['label']
+            f_proba = [forecast_info['proba_low'], forecast_info['proba_med'], forecast_info['proba_high']]
+            f_score = forecast_info['score']
+            confidence = forecast_info['confidence']
+            forecast_color = forecast_info['color']
+            
+            # Display forecast card
+            col1, col2, col3, col4 = st.columns([2, 2, 2, 2])
+            
             with col1:
                 st.markdown(f"""
-                    <div class="metric-card">
-                        <h3 style="margin-top: 0; color: #667eea;">{t['situation']}</h3>
-                        <strong>{t['calendar_risk']}</strong>
-                        <p>{t['calendar_risk_desc']}</p>
-                        <strong>{t['alert_risk']}</strong>
-                        <p>{t['alert_risk_desc']}</p>
-                        <p style="font-size: 1.1rem; color: white; margin: 1rem 0;">
-                        <strong>{t['calendar_risk']}:</strong> {t[calendar_risk.lower()]}<br>
-                        <strong>{t['alert_risk']}:</strong> {t[alert_risk.lower()]}
-                        </p>
-                        <p style="font-size: 1.3rem; font-weight: 600; color: {action_color}; margin-top: 1rem;">
-                        {situation}
+                    <div class="metric-card" style="text-align: center; padding: 1rem;">
+                        <p style="color: #a0aec0; margin: 0; font-size: 0.9rem;">{t['forecasted_date']}</p>
+                        <p style="font-size: 1.3rem; font-weight: 600; color: white; margin: 0.5rem 0;">
+                            {forecast_date.strftime('%b %d, %Y')}
                         </p>
                     </div>
-                    """, unsafe_allow_html=True)
-
+                """, unsafe_allow_html=True)
+            
             with col2:
+                volatility_text = t[f_label.lower()] + " " + t['volatility']
                 st.markdown(f"""
-                    <div class="metric-card">
-                        <h3 style="margin-top: 0; color: #667eea;">{t['farmer_action']}</h3>
-                        <div style="background: {action_color}; padding: 1.5rem; border-radius: 15px; margin-top: 1rem;">
-                        <p style="font-size: 1.2rem; font-weight: 600; color: white; margin: 0; text-align: center; line-height: 1.6;">
-                            {action}
+                    <div class="metric-card" style="text-align: center; padding: 1rem;">
+                        <p style="color: #a0aec0; margin: 0; font-size: 0.9rem;">{t['predicted_volatility']}</p>
+                        <p style="font-size: 1.3rem; font-weight: 700; color: {forecast_color}; margin: 0.5rem 0;">
+                            {volatility_text}
                         </p>
-                        </div>
                     </div>
-                    """, unsafe_allow_html=True)
+                """, unsafe_allow_html=True)
             
+            with col3:
+                st.markdown(f"""
+                    <div class="metric-card" style="text-align: center; padding: 1rem;">
+                        <p style="color: #a0aec0; margin: 0; font-size: 0.9rem;">{t['cvi_score']}</p>
+                        <p style="font-size: 1.3rem; font-weight: 600; color: white; margin: 0.5rem 0;">
+                            {f_score:.2f}
+                        </p>
+                    </div>
+                """, unsafe_allow_html=True)
+            
+            with col4:
+                st.markdown(f"""
+                    <div class="metric-card" style="text-align: center; padding: 1rem;">
+                        <p style="color: #a0aec0; margin: 0; font-size: 0.9rem;">{t['confidence']}</p>
+                        <p style="font-size: 1.3rem; font-weight: 700; color: {forecast_color}; margin: 0.5rem 0;">
+                            {confidence:.1f}%
+                        </p>
+                    </div>
+                """, unsafe_allow_html=True)
+            
+            # Expander for detailed probabilities
+            with st.expander(f"📊 {t['view_details']} - {forecast_date.strftime('%b %d, %Y')}"):
+                prob_labels = [t['low_volatility'], t['med_volatility'], t['high_volatility']]
+                if lite_mode:
+                    st.markdown(probability_bars(f_proba, prob_labels), unsafe_allow_html=True)
+                else:
+                    fig = create_gauge_panel(f_proba, prob_labels, style="compact")
+                    st.plotly_chart(fig, use_container_width=True)
+
+        # Decision Matrix shares the forecast window
+        st.markdown(f"## {t['decision_matrix']}")
+        action_color = view['action_color']
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown(f"""
+                <div class="metric-card">
+                    <h3 style="margin-top: 0; color: #667eea;">{t['situation']}</h3>
+                    <strong>{t['calendar_risk']}</strong>
+                    <p>{t['calendar_risk_desc']}</p>
+                    <strong>{t['alert_risk']}</strong>
+                    <p>{t['alert_risk_desc']}</p>
+                    <p style="font-size: 1.1rem; color: white; margin: 1rem 0;">
+                    <strong>{t['calendar_risk']}:</strong> {view['calendar_risk_text']}<br>
+                    <strong>{t['alert_risk']}:</strong> {view['alert_risk_text']}
+                    </p>
+                    <p style="font-size: 1.3rem; font-weight: 600; color: {action_color}; margin-top: 1rem;">
+                    {view['situation_text']}
+                    </p>
+                </div>
+                """, unsafe_allow_html=True)
+
+        with col2:
+            st.markdown(f"""
+                <div class="metric-card">
+                    <h3 style="margin-top: 0; color: #667eea;">{t['farmer_action']}</h3>
+                    <div style="background: {action_color}; padding: 1.5rem; border-radius: 15px; margin-top: 1rem;">
+                    <p style="font-size: 1.2rem; font-weight: 600; color: white; margin: 0; text-align: center; line-height: 1.6;">
+                        {view['action_text']}
+                    </p>
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
 
-        # except NameError:
-        #     # parse_multi_forecast not defined, fallback to ast.literal_eval
-        #     try:
-        #         forecast_data = ast.literal_eval(pred['multi_next']) if pd.notna(pred['multi_next']) else None
-        #     except Exception:
-        #         forecast_data = None
-        # except Exception:
-        #     # parse_multi_forecast exists but failed, try ast.literal_eval as fallback
-        #     try:
-        #         forecast_data = ast.literal_eval(pred['multi_next']) if pd.notna(pred['multi_next']) else None
-        #     except Exception:
-        #         forecast_data = None
-
-
-
-        
-
-
+    run.lap("forecast_decision")
     st.markdown(f"## {t['momentum_analysis']}")
     
-    col1, col2 = st.columns([2, 1])
-    
-    with col1:
-        fig_momentum = create_momentum_chart(m7, m3, vol7, vol30)
-        st.plotly_chart(fig_momentum, use_container_width=True)
+    # The pipeline's 7/3-day momentum and 7/30-day volatility by default; other
+    # windows are computed from the price series
+    default_windows = DEFAULT_MOMENTUM_WINDOWS + DEFAULT_VOLATILITY_WINDOWS
+    window_keys = ['price_momentum_7', 'price_momentum_3', 'volatility_7', 'volatility_30']
+    windows = default_windows
+    if price_column(store.frame) is not None:
+        with st.expander(f"⚙️ {t['indicator_windows']}"):
+            window_cols = st.columns(4)
+            windows = tuple(
+                int(col.number_input(t[key], 1, MAX_WINDOW, default, key=f"window_{key}"))
+                for col, key, default in zip(window_cols, window_keys, default_windows)
+            )
+    w_long, w_short, w_vol_short, w_vol_long = windows
+    momentum = view['momentum']
+    momentum_title = view['momentum_title']
+    momentum_signal_text = view['momentum_signal_text']
+    if windows != default_windows:
+        features = store.features((w_long, w_short), (w_vol_short, w_vol_long))
+        m7 = features[momentum_column(w_long)].iloc[position]
+        m3 = features[momentum_column(w_short)].iloc[position]
+        vol7 = features[volatility_column(w_vol_short)].iloc[position]
+        vol30 = features[volatility_column(w_vol_long)].iloc[position]
+        # Same thresholds, applied to the chosen long/short momentum
+        momentum = MOMENTUM_STYLES[str(momentum_signal(m7, m3))]
+        momentum_title = t[momentum['title_key']]
+        momentum_signal_text = t[momentum['signal_key']]
+    labels = [
+        t[key] if days == default else t[f"{key.rsplit('_', 1)[0]}_n"].format(n=days)
+        for key, days, default in zip(window_keys, windows, default_windows)
+    ]
+    
+    if lite_mode:
+        # Metrics only, full width
+        col2 = st.container()
+    else:
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            fig_momentum = create_momentum_chart(m7, m3, vol7, vol30, windows)
+            st.plotly_chart(fig_momentum, use_container_width=True)
     
     with col2:
         st.markdown(f"### {t['key_indicators']}")
         
-        st.metric(t['price_momentum_7'], f"{m7:+.2f}%", 
-                 help="Price change over last 7 days")
-        st.metric(t['price_momentum_3'], f"{m3:+.2f}%",
-                 help="Price change over last 3 days")
-        st.metric(t['volatility_7'], f"{vol7:.2f}%",
-                 help="Price fluctuation intensity (7 days)")
-        st.metric(t['volatility_30'], f"{vol30:.2f}%",
-                 help="Price fluctuation intensity (30 days)")
+        st.metric(labels[0], f"{m7:+.2f}%", 
+                 help=f"Price change over last {w_long} days")
+        st.metric(labels[1], f"{m3:+.2f}%",
+                 help=f"Price change over last {w_short} days")
+        st.metric(labels[2], f"{vol7:.2f}%",
+                 help=f"Price fluctuation intensity ({w_vol_short} days)")
+        st.metric(labels[3], f"{vol30:.2f}%",
+                 help=f"Price fluctuation intensity ({w_vol_long} days)")
     
     st.markdown(f"### {t['momentum_interpretation']}")
     
-    if m7 > 3 and m3 > 2:
-        st.markdown(f"""
-        <div style='background: rgba(16, 185, 129, 0.1); backdrop-filter: blur(20px); border-left: 4px solid #10b981; 
-        padding: 1rem; border-radius: 10px; margin: 1rem 0; border: 1px solid rgba(16, 185, 129, 0.3);'>
-            <p style='color: #d1fae5; margin: 0; font-size: 0.95rem;'>
-                <strong style='color: #10b981;'>✓ {t['strong_upward']}</strong><br>
-                • 7-{t['days']} {t['momentum_7day'].lower()}: {m7:+.2f}% (threshold: >3%)<br>
-                • 3-{t['days']} {t['momentum_7day'].lower()}: {m3:+.2f}% (threshold: >2%)<br>
-                • <strong>{t['signal']}:</strong> {t['prices_rising']}
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-    elif m7 < -3 and m3 < -2:
-        st.markdown(f"""
-        <div style='background: rgba(239, 68, 68, 0.1); backdrop-filter: blur(20px); border-left: 4px solid #ef4444; 
-        padding: 1rem; border-radius: 10px; margin: 1rem 0; border: 1px solid rgba(239, 68, 68, 0.3);'>
-            <p style='color: #fecaca; margin: 0; font-size: 0.95rem;'>
-                <strong style='color: #ef4444;'>⚠ {t['strong_downward']}</strong><br>
-                • 7-{t['days']} {t['momentum_7day'].lower()}: {m7:+.2f}% (threshold: <-3%)<br>
-                • 3-{t['days']} {t['momentum_7day'].lower()}: {m3:+.2f}% (threshold: <-2%)<br>
-                • <strong>{t['signal']}:</strong> {t['prices_falling']}
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown(f"""
-        <div style='background: rgba(59, 130, 246, 0.1); backdrop-filter: blur(20px); border-left: 4px solid #3b82f6; 
-        padding: 1rem; border-radius: 10px; margin: 1rem 0; border: 1px solid rgba(59, 130, 246, 0.3);'>
-            <p style='color: #dbeafe; margin: 0; font-size: 0.95rem;'>
-                <strong style='color: #3b82f6;'>ℹ {t['stable_movement']}</strong><br>
-                • 7-{t['days']} {t['momentum_7day'].lower()}: {m7:+.2f}%<br>
-                • 3-{t['days']} {t['momentum_7day'].lower()}: {m3:+.2f}%<br>
-                • <strong>{t['signal']}:</strong> {t['no_strong_trend']}
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown(f"""
+    <div style='background: rgba({momentum['rgb']}, 0.1); backdrop-filter: blur(20px); border-left: 4px solid {momentum['accent']}; 
+    padding: 1rem; border-radius: 10px; margin: 1rem 0; border: 1px solid rgba({momentum['rgb']}, 0.3);'>
+        <p style='color: {momentum['text_color']}; margin: 0; font-size: 0.95rem;'>
+            <strong style='color: {momentum['accent']};'>{momentum['icon']} {momentum_title}</strong><br>
+            • {w_long}-{t['days']} {t['momentum_7day'].lower()}: {m7:+.2f}%{momentum['threshold_7']}<br>
+            • {w_short}-{t['days']} {t['momentum_7day'].lower()}: {m3:+.2f}%{momentum['threshold_3']}<br>
+            • <strong>{t['signal']}:</strong> {momentum_signal_text}
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
     
+    run.lap("momentum")
     st.markdown(f"## {t['volatility_probability']}")
     
-    cols = st.columns(3)
-    
-    probabilities = {t['low']: prob_low, t['med']: prob_med, t['high']: prob_high}
-    color_map = {t['low']: '#10b981', t['med']: '#f59e0b', t['high']: '#ef4444'}
-    
-    for idx, (label, prob) in enumerate(probabilities.items()):
-        with cols[idx]:
-            label_key = 'low' if t['low'] == label else ('high' if t['high'] == label else 'med')
-            volatility_label = t[f'{label_key}_volatility']
-            
-            fig = go.Figure(go.Indicator(
-                mode="gauge+number",
-                value=prob * 100,
-                domain={'x': [0, 1], 'y': [0, 1]},
-                title={'text': volatility_label, 'font': {'size': 18, 'color': 'white'}},
-                number={'suffix': "%", 'font': {'size': 36, 'color': 'white'}},
-                gauge={
-                    'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': 'white'},
-                    'bar': {'color': color_map.get(label, '#667eea'), 'thickness': 0.8},
-                    'bgcolor': "rgba(0, 0, 0, 0.2)",
-                    'borderwidth': 2,
-                    'bordercolor': "rgba(255, 255, 255, 0.2)",
-                    'steps': [
-                        {'range': [0, 33], 'color': 'rgba(16, 185, 129, 0.2)'},
-                        {'range': [33, 66], 'color': 'rgba(245, 158, 11, 0.2)'},
-                        {'range': [66, 100], 'color': 'rgba(239, 68, 68, 0.2)'}
-                    ]
-                }
-            ))
-            
-            fig.update_layout(
-                height=280,
-                margin=dict(l=10, r=10, t=50, b=10),
-                paper_bgcolor='rgba(0, 0, 0, 0.3)',
-                font={'family': 'Inter', 'color': 'white'}
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-    
-    st.markdown(f"## {t['historical_trends']}")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        fig_timeline = create_volatility_timeline(df, selected_date, timeline_days, t)
-        st.plotly_chart(fig_timeline, use_container_width=True)
+    probabilities = [prob_low, prob_med, prob_high]
+    prob_labels = [t['low_volatility'], t['med_volatility'], t['high_volatility']]
+    if lite_mode:
+        st.markdown(probability_bars(probabilities, prob_labels), unsafe_allow_html=True)
+    else:
+        fig = create_gauge_panel(probabilities, prob_labels, style="detail")
+        st.plotly_chart(fig, use_container_width=True)
+    run.lap("gauges")
     
-    with col2:
-        fig_cvi = create_cvi_trend_chart(df, selected_date, timeline_days, t)
-        st.plotly_chart(fig_cvi, use_container_width=True)
+    render_history_section(store, selected_date, st.session_state.language, lite_mode)
+    run.lap("history_charts")
 
 
     st.markdown(f"## {t['risk_summary']}")
@@ -1220,35 +452,38 @@ if not prediction.empty:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        risk_colors = {'Low': '#10b981', 'Med': '#f59e0b', 'Medium': '#f59e0b', 'High': '#ef4444'}
-        
         st.markdown(f"""
-            <div class="risk-indicator" style="background: {risk_colors.get(volatility, '#6366f1')}; color: white;">
-                {t['volatility_risk']}: {t[volatility.lower()]}
+            <div class="risk-indicator" style="background: {view['risk_color']}; color: white;">
+                {t['volatility_risk']}: {view['calendar_risk_text']}
             </div>
         """, unsafe_allow_html=True)
     
     with col2:
-        movement_colors = {'Up': '#10b981', 'Down': '#ef4444', 'Stable': '#6366f1'}
-        
         st.markdown(f"""
-            <div class="risk-indicator" style="background: {movement_colors.get(price_movement, '#6366f1')}; color: white;">
-                {t['price_trend']}: {t[price_movement.lower()]}
+            <div class="risk-indicator" style="background: {view['movement_color']}; color: white;">
+                {t['price_trend']}: {view['price_text']}
             </div>
         """, unsafe_allow_html=True)
     
     with col3:
-        volatility_numeric = {'Low': 1, 'Med': 2, 'Medium': 2, 'High': 3}.get(volatility, 2)
-        health_score = (3 - volatility_numeric) * 33.33
-        health_label = "Excellent" if health_score > 66 else "Fair" if health_score > 33 else "Poor"
-        health_color = "#10b981" if health_score > 66 else "#f59e0b" if health_score > 33 else "#ef4444"
-        
         st.markdown(f"""
-            <div class="risk-indicator" style="background: {health_color}; color: white;">
-                {t['market_health']}: {t[health_label.lower()]}
+            <div class="risk-indicator" style="background: {view['health_color']}; color: white;">
+                {t['market_health']}: {view['health_text']}
             </div>
         """, unsafe_allow_html=True)
+    run.lap("risk_summary")
     
 
 else:
     st.warning("No prediction data available for the selected date.")
+
+timings = run.finish()
+if timings:
+    with st.expander("⏱️ Render timings"):
+        this_run = pd.DataFrame(timings, columns=["section", "seconds"])
+        this_run["ms"] = this_run.pop("seconds") * 1000
+        st.dataframe(this_run, hide_index=True)
+        st.caption("Across sessions in this process")
+        stats = pd.DataFrame(profiling.summary(), columns=["section", "count", "p50", "p95"])
+        stats[["p50", "p95"]] *= 1000
+        st.dataframe(stats.rename(columns={"p50": "p50 ms", "p95": "p95 ms"}), hide_index=True)